@@ -3,53 +3,178 @@ Market Agent for collecting and analyzing crop prices and market data
 """
 
 import requests
-import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 
+from utils.cache import get_shared_cache
+from utils.http import HTTP_SESSION
+from utils.noise import NoiseBuffer
+
+# Base prices for common crops (USD per ton) - simplified for demo
+_BASE_PRICES = MappingProxyType({
+    'wheat': 250,
+    'corn': 200,
+    'rice': 400,
+    'soybeans': 450,
+    'cotton': 1600,  # per ton of cotton
+    'tomatoes': 800,
+    'potatoes': 300,
+    'carrots': 350
+})
+
+# Production costs (USD per hectare) - simplified estimates
+_PRODUCTION_COSTS = MappingProxyType({
+    'wheat': 400,
+    'corn': 500,
+    'rice': 800,
+    'soybeans': 450,
+    'cotton': 1200,
+    'tomatoes': 2000,
+    'potatoes': 1500,
+    'carrots': 1200
+})
+
+# Typical yields (tons per hectare)
+_TYPICAL_YIELDS = MappingProxyType({
+    'wheat': 3.0,
+    'corn': 9.0,
+    'rice': 4.5,
+    'soybeans': 2.8,
+    'cotton': 1.5,
+    'tomatoes': 50.0,
+    'potatoes': 25.0,
+    'carrots': 30.0
+})
+
+# Struct-of-arrays view of the crop tables, indexed via _CROP_INDEX.
+# Each array carries a trailing 0 slot that unknown crops map to (-1).
+_CROP_INDEX = MappingProxyType({crop: i for i, crop in enumerate(_BASE_PRICES)})
+
+
+def _crop_column(table) -> np.ndarray:
+    """Lay out a per-crop table as a read-only float array in _CROP_INDEX order"""
+    column = np.array([table.get(crop, 0) for crop in _CROP_INDEX] + [0], dtype=np.float64)
+    column.setflags(write=False)
+    return column
+
+
+_BASE_ARR = _crop_column(_BASE_PRICES)
+_COST_ARR = _crop_column(_PRODUCTION_COSTS)
+_YIELD_ARR = _crop_column(_TYPICAL_YIELDS)
+
+# Seasonal price multipliers for the next six months
+_SEASONAL_PATTERNS = MappingProxyType({
+    crop: np.asarray(pattern, dtype=np.float64)
+    for crop, pattern in {
+        'wheat': [1.1, 1.05, 1.0, 0.95, 0.9, 0.95],  # Higher in early months
+        'corn': [0.95, 1.0, 1.05, 1.1, 1.05, 1.0],   # Peak mid-year
+        'rice': [1.0, 1.0, 1.05, 1.1, 1.05, 1.0],
+        'tomatoes': [1.2, 1.1, 1.0, 0.9, 1.0, 1.1],  # Seasonal variation
+        'potatoes': [1.0, 1.05, 1.1, 1.05, 1.0, 0.95]
+    }.items()
+})
+_FLAT_PATTERN = np.ones(6)
+
+# Simulated market locations with different prices
+_MARKETS_DTYPE = np.dtype([
+    ('name', 'U40'),
+    ('type', 'U20'),
+    ('distance_km', 'f8'),
+    ('price_premium', 'f8'),
+    ('contact', 'U60'),
+    ('requirements', 'U80')
+])
+_MARKETS = np.array([
+    ('Local Farmers Market', 'farmers_market', 15, 1.2,  # 20% premium
+     'info@localmarket.com', 'Organic certification preferred'),
+    ('Regional Wholesale Market', 'wholesale', 45, 1.1,  # 10% premium
+     'buyers@regionalwholesale.com', 'Minimum 5 tons'),
+    ('Processing Plant', 'processor', 80, 0.95,  # 5% discount
+     'procurement@processor.com', 'Contract required, bulk quantities'),
+    ('Export Terminal', 'export', 120, 1.15,  # 15% premium
+     'export@terminal.com', 'International quality standards')
+], dtype=_MARKETS_DTYPE)
+for _table in (*_SEASONAL_PATTERNS.values(), _FLAT_PATTERN, _MARKETS):
+    _table.setflags(write=False)
+
+
+# (epoch second, isoformat string) of the last timestamp handed out
+_timestamp_cache = [None, '']
+
+
+def _timestamp() -> str:
+    """Current UTC time in ISO format, formatted once per wall-clock second"""
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache[:] = [second, datetime.fromtimestamp(second, timezone.utc).isoformat()]
+    return _timestamp_cache[1]
+
+
+# Simplified price risk per crop
+_PRICE_RISK_FACTORS = {
+    'wheat': 'medium',
+    'corn': 'medium',
+    'rice': 'low',
+    'soybeans': 'high',
+    'cotton': 'high',
+    'tomatoes': 'high',
+    'potatoes': 'medium',
+    'carrots': 'medium'
+}
+
+
+@lru_cache(maxsize=32)
+def _price_risk(crop: str) -> Tuple[str, str, str]:
+    """(risk_level, volatility, market_stability) for a crop"""
+    risk_level = _PRICE_RISK_FACTORS.get(crop, 'medium')
+    high = risk_level == 'high'
+    return risk_level, 'high' if high else 'moderate', 'unstable' if high else 'stable'
+
+
 class MarketAgent:
     """Specialized agent for market data collection and price analysis"""
+
+    # Shared PCG64 generator - faster than the legacy global np.random state
+    _rng = np.random.default_rng()
+    # Pre-drawn N(0, 1) samples; most calls only need one to seven values
+    _noise = NoiseBuffer(_rng)
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, session: Optional[requests.Session] = None):
         self.config = config
         self.commodities_url = config['MARKET_API_CONFIG']['commodities_api_url']
+        # Pooled HTTP session shared across agents unless one is injected
+        self.session = session or HTTP_SESSION
         
-        # Base prices for common crops (USD per ton) - simplified for demo
-        self.base_prices = {
-            'wheat': 250,
-            'corn': 200,
-            'rice': 400,
-            'soybeans': 450,
-            'cotton': 1600,  # per ton of cotton
-            'tomatoes': 800,
-            'potatoes': 300,
-            'carrots': 350
-        }
+        # Price snapshots are cached briefly in the process-wide cache
+        cache_config = config.get('CACHE_CONFIG', {})
+        self.cache = get_shared_cache(cache_config)
+        self.cache_ttl = cache_config.get('market_ttl', 300)
         
-        # Production costs (USD per hectare) - simplified estimates
-        self.production_costs = {
-            'wheat': 400,
-            'corn': 500,
-            'rice': 800,
-            'soybeans': 450,
-            'cotton': 1200,
-            'tomatoes': 2000,
-            'potatoes': 1500,
-            'carrots': 1200
-        }
-        
-        # Typical yields (tons per hectare)
-        self.typical_yields = {
-            'wheat': 3.0,
-            'corn': 9.0,
-            'rice': 4.5,
-            'soybeans': 2.8,
-            'cotton': 1.5,
-            'tomatoes': 50.0,
-            'potatoes': 25.0,
-            'carrots': 30.0
-        }
+        # Shared read-only tables - binding them here copies nothing
+        self.base_prices = _BASE_PRICES
+        self.production_costs = _PRODUCTION_COSTS
+        self.typical_yields = _TYPICAL_YIELDS
+        self._idx = _CROP_INDEX
+        self._base = _BASE_ARR
+        self._cost = _COST_ARR
+        self._yield = _YIELD_ARR
+        self._seasonal_patterns = _SEASONAL_PATTERNS
+        self._flat_pattern = _FLAT_PATTERN
+        self._markets_dtype = _MARKETS_DTYPE
+        self._markets_arr = _MARKETS
+    
+    def _sample_prices(self, idx: List[int]):
+        """
+        Sample current prices for crop indices: (base prices, volatilities, rounded prices)
+        """
+        base_prices = self._base[idx]
+        # Add some market volatility (±10%)
+        volatilities = self._noise.normal(1.0, 0.1, base_prices.size)
+        return base_prices, volatilities, np.round(base_prices * volatilities, 2)
     
     def get_current_prices(self, crops: List[str] = None) -> Dict:
         """
@@ -59,31 +184,39 @@ class MarketAgent:
             if crops is None:
                 crops = list(self.base_prices.keys())
             
-            prices = {}
+            cache_key = "mkt:prices:" + ",".join(crops)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
             
-            for crop in crops:
-                # In a real implementation, you would fetch from actual commodity APIs
-                base_price = self.base_prices.get(crop, 0)
-                
-                # Add some market volatility (±10%)
-                volatility = np.random.normal(1.0, 0.1)
-                current_price = base_price * volatility
-                
+            # In a real implementation, you would fetch from actual commodity APIs
+            base_prices, volatilities, current_prices = self._sample_prices(
+                [self._idx.get(crop, -1) for crop in crops]
+            )
+            change_percents = np.round((volatilities - 1) * 100, 2)
+            
+            timestamp = _timestamp()
+            prices = {}
+            for crop, base_price, current_price, change_percent in zip(
+                crops, base_prices.tolist(), current_prices.tolist(), change_percents.tolist()
+            ):
                 prices[crop] = {
-                    'current_price': round(current_price, 2),
+                    'current_price': current_price,
                     'base_price': base_price,
-                    'price_change_percent': round((volatility - 1) * 100, 2),
+                    'price_change_percent': change_percent,
                     'currency': 'USD',
                     'unit': 'per_ton',
-                    'last_updated': datetime.now().isoformat()
+                    'last_updated': timestamp
                 }
             
-            return {
+            market_data = {
                 'prices': prices,
                 'market_status': self._assess_market_status(),
                 'data_source': 'Simulated Market Data',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': timestamp
             }
+            self.cache.set(cache_key, market_data, self.cache_ttl)
+            return market_data
             
         except Exception as e:
             print(f"Error fetching market prices: {e}")
@@ -94,39 +227,36 @@ class MarketAgent:
         Get historical price data for trend analysis
         """
         try:
-            base_price = self.base_prices.get(crop, 0)
+            base_price = float(self._base[self._idx.get(crop, -1)])
             if base_price == 0:
                 return {'error': f'No price data available for {crop}'}
             
-            # Generate simulated historical data
-            dates = []
-            prices = []
-            
-            for i in range(days):
-                date = datetime.now() - timedelta(days=days-i)
-                dates.append(date.strftime('%Y-%m-%d'))
-                
-                # Add trend and volatility
-                trend_factor = 1 + (i / days) * 0.1  # Slight upward trend
-                volatility = np.random.normal(1.0, 0.05)
-                price = base_price * trend_factor * volatility
-                prices.append(round(price, 2))
-            
-            # Calculate statistics
-            avg_price = np.mean(prices)
-            price_volatility = np.std(prices)
+            # Generate simulated historical data in one vectorized pass
+            today = np.datetime64(datetime.now().date())
+            dates = (today - np.arange(days, 0, -1).astype('timedelta64[D]')).astype(str).tolist()
+
+            # Add trend and volatility
+            trend_factor = 1 + np.arange(days) / days * 0.1  # Slight upward trend
+            volatility = self._noise.normal(1.0, 0.05, days)
+            prices_arr = np.round(base_price * trend_factor * volatility, 2)
+            prices = prices_arr.tolist()
+
+            # Calculate statistics, reusing the mean for the standard deviation
+            avg_price = prices_arr.mean()
+            deviations = prices_arr - avg_price
+            price_volatility = np.sqrt(np.dot(deviations, deviations) / deviations.size)
             trend = 'increasing' if prices[-1] > prices[0] else 'decreasing'
-            
+
             return {
                 'crop': crop,
                 'dates': dates,
                 'prices': prices,
                 'statistics': {
-                    'average_price': round(avg_price, 2),
-                    'volatility': round(price_volatility, 2),
+                    'average_price': round(float(avg_price), 2),
+                    'volatility': round(float(price_volatility), 2),
                     'trend': trend,
-                    'min_price': min(prices),
-                    'max_price': max(prices)
+                    'min_price': float(prices_arr.min()),
+                    'max_price': float(prices_arr.max())
                 }
             }
             
@@ -143,59 +273,96 @@ class MarketAgent:
         """
         Calculate detailed profit analysis for a crop
         """
+        return self.calculate_profit_analysis_many([crop], land_area, [custom_yield])[0]
+    
+    def calculate_profit_analysis_many(
+        self, 
+        crops: List[str], 
+        land_area: float = 1.0,
+        custom_yields: Optional[List[Optional[float]]] = None
+    ) -> List[Dict]:
+        """
+        Calculate detailed profit analysis for several crops in one vectorized pass
+        """
         try:
-            # Get current price
-            current_prices = self.get_current_prices([crop])
-            crop_price = current_prices['prices'].get(crop, {}).get('current_price', 0)
-            
-            # Get costs and yields
-            production_cost = self.production_costs.get(crop, 0)
-            expected_yield = custom_yield or self.typical_yields.get(crop, 0)
-            
-            if crop_price == 0 or production_cost == 0 or expected_yield == 0:
-                return {'error': f'Insufficient data for {crop} profit analysis'}
+            # Gather prices, costs and yields for all crops
+            idx = [self._idx.get(crop, -1) for crop in crops]
+            _, _, crop_prices = self._sample_prices(idx)
+            production_costs = self._cost[idx]
+            expected_yields = self._yield[idx]
+            if custom_yields is not None:
+                expected_yields = np.array([
+                    custom or default
+                    for custom, default in zip(custom_yields, expected_yields.tolist())
+                ], dtype=np.float64)
             
             # Calculate financials
-            total_yield = expected_yield * land_area
-            gross_revenue = total_yield * crop_price
-            total_costs = production_cost * land_area
-            net_profit = gross_revenue - total_costs
+            total_yields = expected_yields * land_area
+            gross_revenues = total_yields * crop_prices
+            total_costs = production_costs * land_area
+            net_profits = gross_revenues - total_costs
             
             # Calculate metrics
-            profit_margin = (net_profit / gross_revenue * 100) if gross_revenue > 0 else 0
-            roi = (net_profit / total_costs * 100) if total_costs > 0 else 0
-            breakeven_price = total_costs / total_yield if total_yield > 0 else 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                profit_margins = np.where(gross_revenues > 0, net_profits / gross_revenues * 100, 0)
+                rois = np.where(total_costs > 0, net_profits / total_costs * 100, 0)
+                breakeven_prices = np.where(total_yields > 0, total_costs / total_yields, 0)
+                profits_per_hectare = net_profits / land_area if land_area else np.zeros_like(net_profits)
             
-            # Risk assessment
-            risk_level = self._assess_price_risk(crop)
+            columns = zip(
+                crops,
+                crop_prices.tolist(),
+                production_costs.tolist(),
+                expected_yields.tolist(),
+                total_yields.tolist(),
+                np.round(gross_revenues, 2).tolist(),
+                np.round(total_costs, 2).tolist(),
+                np.round(net_profits, 2).tolist(),
+                np.round(profit_margins, 2).tolist(),
+                np.round(rois, 2).tolist(),
+                np.round(breakeven_prices, 2).tolist(),
+                np.round(profits_per_hectare, 2).tolist()
+            )
             
-            return {
-                'crop': crop,
-                'land_area_hectares': land_area,
-                'financial_analysis': {
-                    'gross_revenue': round(gross_revenue, 2),
-                    'total_costs': round(total_costs, 2),
-                    'net_profit': round(net_profit, 2),
-                    'profit_margin': round(profit_margin, 2),
-                    'roi_percentage': round(roi, 2),
-                    'profit_per_hectare': round(net_profit / land_area, 2)
-                },
-                'production_details': {
-                    'expected_yield_tons': round(total_yield, 2),
-                    'yield_per_hectare': expected_yield,
-                    'current_price_per_ton': crop_price,
-                    'production_cost_per_hectare': production_cost,
-                    'breakeven_price': round(breakeven_price, 2)
-                },
-                'risk_assessment': risk_level,
-                'recommendations': self._generate_profit_recommendations(
-                    net_profit, roi, risk_level
-                )
-            }
+            analyses = []
+            for (crop, crop_price, production_cost, expected_yield, total_yield, gross_revenue,
+                 total_cost, net_profit, profit_margin, roi, breakeven_price, profit_per_hectare) in columns:
+                if crop_price == 0 or production_cost == 0 or expected_yield == 0:
+                    analyses.append({'error': f'Insufficient data for {crop} profit analysis'})
+                    continue
+                
+                # Risk assessment
+                risk_level = self._assess_price_risk(crop)
+                
+                analyses.append({
+                    'crop': crop,
+                    'land_area_hectares': land_area,
+                    'financial_analysis': {
+                        'gross_revenue': gross_revenue,
+                        'total_costs': total_cost,
+                        'net_profit': net_profit,
+                        'profit_margin': profit_margin,
+                        'roi_percentage': roi,
+                        'profit_per_hectare': profit_per_hectare
+                    },
+                    'production_details': {
+                        'expected_yield_tons': round(total_yield, 2),
+                        'yield_per_hectare': expected_yield,
+                        'current_price_per_ton': crop_price,
+                        'production_cost_per_hectare': production_cost,
+                        'breakeven_price': breakeven_price
+                    },
+                    'risk_assessment': risk_level,
+                    'recommendations': self._generate_profit_recommendations(
+                        net_profit, roi, risk_level
+                    )
+                })
+            
+            return analyses
             
         except Exception as e:
             print(f"Error calculating profit analysis: {e}")
-            return {'error': str(e)}
+            return [{'error': str(e)} for _ in crops]
     
     def find_best_markets(
         self, 
@@ -207,70 +374,37 @@ class MarketAgent:
         Find best markets and buyers for a crop
         """
         try:
-            # Simulated market locations with different prices
-            markets = [
-                {
-                    'name': 'Local Farmers Market',
-                    'type': 'farmers_market',
-                    'distance_km': 15,
-                    'price_premium': 1.2,  # 20% premium
-                    'contact': 'info@localmarket.com',
-                    'requirements': 'Organic certification preferred'
-                },
-                {
-                    'name': 'Regional Wholesale Market',
-                    'type': 'wholesale',
-                    'distance_km': 45,
-                    'price_premium': 1.1,  # 10% premium
-                    'contact': 'buyers@regionalwholesale.com',
-                    'requirements': 'Minimum 5 tons'
-                },
-                {
-                    'name': 'Processing Plant',
-                    'type': 'processor',
-                    'distance_km': 80,
-                    'price_premium': 0.95,  # 5% discount
-                    'contact': 'procurement@processor.com',
-                    'requirements': 'Contract required, bulk quantities'
-                },
-                {
-                    'name': 'Export Terminal',
-                    'type': 'export',
-                    'distance_km': 120,
-                    'price_premium': 1.15,  # 15% premium
-                    'contact': 'export@terminal.com',
-                    'requirements': 'International quality standards'
-                }
-            ]
-            
             # Filter by distance and calculate potential prices
-            base_price = self.base_prices.get(crop, 0)
-            available_markets = []
+            base_price = float(self._base[self._idx.get(crop, -1)])
+            markets = self._markets_arr[self._markets_arr['distance_km'] <= max_distance]
             
-            for market in markets:
-                if market['distance_km'] <= max_distance:
-                    potential_price = base_price * market['price_premium']
-                    transport_cost = market['distance_km'] * 0.5  # $0.5 per km
-                    net_price = potential_price - transport_cost
-                    
-                    market_info = market.copy()
-                    market_info.update({
-                        'potential_price': round(potential_price, 2),
-                        'transport_cost': round(transport_cost, 2),
-                        'net_price': round(net_price, 2),
-                        'profit_potential': 'high' if net_price > base_price * 1.05 else 'medium'
-                    })
-                    available_markets.append(market_info)
+            potential_prices = base_price * markets['price_premium']
+            transport_costs = markets['distance_km'] * 0.5  # $0.5 per km
+            high_potential = potential_prices - transport_costs > base_price * 1.05
+            net_prices = np.round(potential_prices - transport_costs, 2)
             
-            # Sort by net price
-            available_markets.sort(key=lambda x: x['net_price'], reverse=True)
+            # Best net price first; stable so ties keep their table order
+            order = np.argsort(-net_prices, kind='stable').tolist()
+            
+            fields = markets.dtype.names
+            available_markets = [
+                {
+                    **dict(zip(fields, markets[i].tolist())),
+                    'potential_price': round(float(potential_prices[i]), 2),
+                    'transport_cost': round(float(transport_costs[i]), 2),
+                    'net_price': float(net_prices[i]),
+                    'profit_potential': 'high' if high_potential[i] else 'medium'
+                }
+                for i in order
+            ]
+            best_markets = available_markets[:3]
             
             return {
                 'crop': crop,
                 'markets_found': len(available_markets),
-                'best_markets': available_markets[:3],  # Top 3
+                'best_markets': best_markets,  # Top 3
                 'all_markets': available_markets,
-                'recommendations': self._generate_market_recommendations(available_markets)
+                'recommendations': self._generate_market_recommendations(best_markets)
             }
             
         except Exception as e:
@@ -282,31 +416,29 @@ class MarketAgent:
         Forecast seasonal price trends
         """
         try:
-            base_price = self.base_prices.get(crop, 0)
+            base_price = float(self._base[self._idx.get(crop, -1)])
             if base_price == 0:
                 return {'error': f'No price data for {crop}'}
             
-            seasonal_patterns = {
-                'wheat': [1.1, 1.05, 1.0, 0.95, 0.9, 0.95],  # Higher in early months
-                'corn': [0.95, 1.0, 1.05, 1.1, 1.05, 1.0],   # Peak mid-year
-                'rice': [1.0, 1.0, 1.05, 1.1, 1.05, 1.0],
-                'tomatoes': [1.2, 1.1, 1.0, 0.9, 1.0, 1.1],  # Seasonal variation
-                'potatoes': [1.0, 1.05, 1.1, 1.05, 1.0, 0.95]
-            }
+            pattern = self._seasonal_patterns.get(crop, self._flat_pattern)[:months_ahead]
             
-            pattern = seasonal_patterns.get(crop, [1.0] * 6)[:months_ahead]
+            # Price every month in one broadcast multiply
+            noise = self._noise.normal(1.0, 0.05, pattern.size)
+            forecasted_prices = np.round(base_price * pattern * noise, 2).tolist()
+            trends = np.where(pattern > 1.0, 'up', np.where(pattern < 1.0, 'down', 'stable')).tolist()
             
-            forecast = []
-            for i, multiplier in enumerate(pattern):
-                month_date = datetime.now() + timedelta(days=30*i)
-                forecasted_price = base_price * multiplier * np.random.normal(1.0, 0.05)
-                
-                forecast.append({
+            now = datetime.now()
+            month_dates = [now + timedelta(days=30*i) for i in range(pattern.size)]
+            
+            forecast = [
+                {
                     'month': month_date.strftime('%Y-%m'),
                     'month_name': month_date.strftime('%B %Y'),
-                    'forecasted_price': round(forecasted_price, 2),
-                    'price_trend': 'up' if multiplier > 1.0 else 'down' if multiplier < 1.0 else 'stable'
-                })
+                    'forecasted_price': price,
+                    'price_trend': trend
+                }
+                for month_date, price, trend in zip(month_dates, forecasted_prices, trends)
+            ]
             
             return {
                 'crop': crop,
@@ -322,29 +454,12 @@ class MarketAgent:
     def _assess_market_status(self) -> str:
         """Assess overall market conditions"""
         conditions = ['stable', 'volatile', 'bullish', 'bearish']
-        return np.random.choice(conditions)
+        return self._rng.choice(conditions)
     
     def _assess_price_risk(self, crop: str) -> Dict:
         """Assess price risk for a crop"""
-        # Simplified risk assessment
-        risk_factors = {
-            'wheat': 'medium',
-            'corn': 'medium',
-            'rice': 'low',
-            'soybeans': 'high',
-            'cotton': 'high',
-            'tomatoes': 'high',
-            'potatoes': 'medium',
-            'carrots': 'medium'
-        }
-        
-        risk_level = risk_factors.get(crop, 'medium')
-        
-        return {
-            'risk_level': risk_level,
-            'volatility': 'high' if risk_level == 'high' else 'moderate',
-            'market_stability': 'unstable' if risk_level == 'high' else 'stable'
-        }
+        risk_level, volatility, market_stability = _price_risk(crop)
+        return {'risk_level': risk_level, 'volatility': volatility, 'market_stability': market_stability}
     
     def _generate_profit_recommendations(
         self, 
@@ -394,6 +509,7 @@ class MarketAgent:
     
     def _get_default_prices(self) -> Dict:
         """Default price data when APIs fail"""
+        timestamp = _timestamp()
         default_prices = {}
         for crop, price in self.base_prices.items():
             default_prices[crop] = {
@@ -402,12 +518,12 @@ class MarketAgent:
                 'price_change_percent': 0,
                 'currency': 'USD',
                 'unit': 'per_ton',
-                'last_updated': datetime.now().isoformat()
+                'last_updated': timestamp
             }
         
         return {
             'prices': default_prices,
             'market_status': 'stable',
             'data_source': 'Default Data',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
@@ -3,21 +3,108 @@ Soil Agent for collecting and analyzing soil data
 """
 
 import requests
-import json
 from typing import Dict, List, Optional
 import numpy as np
 
+from utils.cache import get_shared_cache
+from utils.http import HTTP_SESSION
+from utils.noise import NoiseBuffer
+
+# pH score ladder: optimal band 6.0-7.0 scores 100, each 0.5 step away
+# drops 20 points down to a floor of 40. Upper edges are nudged so the
+# bands stay closed on the side nearest neutral.
+_PH_BREAKS = np.array([5.0, 5.5, 6.0] + [np.nextafter(edge, np.inf) for edge in (7.0, 7.5, 8.0)])
+_PH_SCORES = np.array([40, 60, 80, 100, 80, 60, 40])
+
+# Organic matter score ladder (% organic matter)
+_ORGANIC_BREAKS = np.array([1.0, 2.0, 3.0])
+_ORGANIC_SCORES = np.array([40, 60, 80, 100])
+
+# Latitude bands: <25, 25-35 (south), 35-45 (midwest), 45-50 (north), >50.
+# np.digitize(..., right=True) closes bands on the upper edge; the 25 edge
+# is nudged down so the southern band includes 25 itself.
+_LAT_BREAKS = np.array([np.nextafter(25.0, -np.inf), 35.0, 45.0, 50.0])
+_SOUTHERN_BAND = 1
+_SOIL_BY_BAND = np.array(['loam', 'sandy loam', 'loam', 'silt loam', 'loam'])
+_PH_MEAN_BY_BAND = np.array([6.2, 5.8, 6.5, 6.2, 6.2])
+_PH_STD_BY_BAND = np.array([0.3, 0.3, 0.4, 0.3, 0.3])
+
+# Soil recommendation rules over [ph, organic_matter, nitrogen, phosphorus, potassium]
+# columns: (column, fires below threshold?, threshold, message), in output order
+_SOIL_RULES = [
+    (0, True, 6.0, "Apply lime to increase soil pH"),
+    (0, False, 7.5, "Apply sulfur or organic matter to lower soil pH"),
+    (1, True, 2.0, "Add compost or organic matter to improve soil structure"),
+    (2, True, 20, "Apply nitrogen fertilizer or nitrogen-fixing cover crops"),
+    (2, False, 40, "Reduce nitrogen inputs to prevent leaching"),
+    (3, True, 10, "Apply phosphorus fertilizer"),
+    (4, True, 100, "Apply potassium fertilizer or potash"),
+]
+_RULE_COLUMNS = np.array([rule[0] for rule in _SOIL_RULES])
+_RULE_BELOW = np.array([rule[1] for rule in _SOIL_RULES])
+_RULE_THRESHOLDS = np.array([rule[2] for rule in _SOIL_RULES], dtype=np.float64)
+_RULE_MESSAGES = np.array([rule[3] for rule in _SOIL_RULES], dtype=object)
+
+
+def _nutrient_score_scalar(n: float, p: float, k: float) -> float:
+    """NPK score for a single sample: 100 inside the optimal band, linear decay outside"""
+    n_score = 100.0 if 20.0 <= n <= 40.0 else max(0.0, 100.0 - abs(n - 30.0) * 3.0)
+    p_score = 100.0 if 10.0 <= p <= 25.0 else max(0.0, 100.0 - abs(p - 17.5) * 4.0)
+    k_score = 100.0 if 100.0 <= k <= 150.0 else max(0.0, 100.0 - abs(k - 125.0) * 1.0)
+    
+    return (n_score + p_score + k_score) / 3
+
+
+def _nutrient_score_vec(n: np.ndarray, p: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """NPK scores for arrays of samples, same rules as _nutrient_score_scalar"""
+    n, p, k = (np.asarray(x, dtype=np.float64) for x in (n, p, k))
+    n_score = np.where((n >= 20.0) & (n <= 40.0), 100.0, np.maximum(0.0, 100.0 - np.abs(n - 30.0) * 3.0))
+    p_score = np.where((p >= 10.0) & (p <= 25.0), 100.0, np.maximum(0.0, 100.0 - np.abs(p - 17.5) * 4.0))
+    k_score = np.where((k >= 100.0) & (k <= 150.0), 100.0, np.maximum(0.0, 100.0 - np.abs(k - 125.0) * 1.0))
+    
+    return (n_score + p_score + k_score) / 3
+
+
+def _score_soil(ph, organic_matter, n, p, k):
+    """
+    pH, nutrient and organic matter scores in one pass.
+    Accepts scalars or equally shaped arrays of samples.
+    """
+    ph_score = _PH_SCORES[np.searchsorted(_PH_BREAKS, ph, side='right')]
+    nutrient_score = _nutrient_score_vec(n, p, k)
+    organic_score = _ORGANIC_SCORES[np.searchsorted(_ORGANIC_BREAKS, organic_matter, side='right')]
+    
+    return ph_score, nutrient_score, organic_score
+
+
 class SoilAgent:
     """Specialized agent for soil data collection and analysis"""
+
+    # Shared PCG64 generator - faster than the legacy global np.random state
+    _rng = np.random.default_rng()
+    # Pre-drawn N(0, 1) samples; most calls only need one to seven values
+    _noise = NoiseBuffer(_rng)
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, session: Optional[requests.Session] = None):
         self.config = config
         self.usda_soil_url = config['SOIL_API_CONFIG']['usda_soil_url']
+        # Pooled HTTP session shared across agents unless one is injected
+        self.session = session or HTTP_SESSION
+        
+        # Soil results are cached per ~1km grid cell in the process-wide cache
+        cache_config = config.get('CACHE_CONFIG', {})
+        self.cache = get_shared_cache(cache_config)
+        self.cache_ttl = cache_config.get('soil_ttl', 86400)
     
     def get_soil_data(self, latitude: float, longitude: float) -> Dict:
         """
         Get soil data for a specific location
         """
+        cache_key = f"soil:{latitude:.2f}:{longitude:.2f}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Try to get data from multiple sources
             soil_data = {}
@@ -30,6 +117,7 @@ class SoilAgent:
             soil_analysis = self._analyze_soil_quality(soil_data)
             soil_data.update(soil_analysis)
             
+            self.cache.set(cache_key, soil_data, self.cache_ttl)
             return soil_data
             
         except Exception as e:
@@ -51,10 +139,10 @@ class SoilAgent:
             return {
                 'soil_type': soil_type,
                 'soil_ph': ph_level,
-                'organic_matter': np.random.normal(2.5, 0.5),  # Typical range 1-4%
-                'nitrogen_level': np.random.normal(25, 5),     # mg/kg
-                'phosphorus_level': np.random.normal(15, 3),   # mg/kg
-                'potassium_level': np.random.normal(120, 20),  # mg/kg
+                'organic_matter': self._noise.normal(2.5, 0.5),  # Typical range 1-4%
+                'nitrogen_level': self._noise.normal(25, 5),     # mg/kg
+                'phosphorus_level': self._noise.normal(15, 3),   # mg/kg
+                'potassium_level': self._noise.normal(120, 20),  # mg/kg
                 'drainage': self._estimate_drainage(soil_type),
                 'data_source': 'Estimated'
             }
@@ -67,32 +155,35 @@ class SoilAgent:
         """
         Estimate soil type based on geographical location (simplified)
         """
+        return str(self.estimate_soil_type_vec(np.array([latitude]), np.array([longitude]))[0])
+    
+    def estimate_soil_type_vec(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """
+        Estimate soil types for arrays of coordinates
+        """
         # This is a simplified estimation - in practice you'd use proper soil databases
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        bands = np.digitize(latitudes, _LAT_BREAKS, right=True)
         
-        # General patterns for different regions
-        if 25 <= latitude <= 35:  # Southern regions
-            if -100 <= longitude <= -80:
-                return 'clay loam'
-            else:
-                return 'sandy loam'
-        elif 35 <= latitude <= 45:  # Midwest regions
-            return 'loam'
-        elif 45 <= latitude <= 50:  # Northern regions
-            return 'silt loam'
-        else:
-            return 'loam'  # Default
+        # Southern regions split into clay loam (-100..-80 longitude) and sandy loam
+        clay_belt = (bands == _SOUTHERN_BAND) & (longitudes >= -100) & (longitudes <= -80)
+        return np.where(clay_belt, 'clay loam', _SOIL_BY_BAND[bands])
     
     def _estimate_soil_ph(self, latitude: float, longitude: float) -> float:
         """
         Estimate soil pH based on geographical patterns
         """
-        # Simplified estimation based on regional patterns
-        if 25 <= latitude <= 35:  # Southern regions tend to be more acidic
-            return np.random.normal(5.8, 0.3)
-        elif 35 <= latitude <= 45:  # Midwest - neutral to slightly alkaline
-            return np.random.normal(6.5, 0.4)
-        else:  # Northern regions
-            return np.random.normal(6.2, 0.3)
+        # Southern regions tend to be more acidic, the midwest neutral to slightly alkaline
+        band = int(np.digitize(latitude, _LAT_BREAKS, right=True))
+        return self._noise.normal(_PH_MEAN_BY_BAND[band], _PH_STD_BY_BAND[band])
+    
+    def estimate_soil_ph_vec(self, latitudes: np.ndarray) -> np.ndarray:
+        """
+        Estimate soil pH for an array of latitudes
+        """
+        bands = np.digitize(np.asarray(latitudes, dtype=np.float64), _LAT_BREAKS, right=True)
+        return self._noise.normal(_PH_MEAN_BY_BAND[bands], _PH_STD_BY_BAND[bands], bands.size)
     
     def _estimate_drainage(self, soil_type: str) -> str:
         """
@@ -119,9 +210,9 @@ class SoilAgent:
             potassium = soil_data.get('potassium_level', 120)
             
             # Calculate quality scores (0-100)
-            ph_score = self._calculate_ph_score(ph)
-            nutrient_score = self._calculate_nutrient_score(nitrogen, phosphorus, potassium)
-            organic_score = self._calculate_organic_score(organic_matter)
+            ph_score, nutrient_score, organic_score = (
+                score.item() for score in _score_soil(ph, organic_matter, nitrogen, phosphorus, potassium)
+            )
             
             overall_score = (ph_score + nutrient_score + organic_score) / 3
             
@@ -143,34 +234,19 @@ class SoilAgent:
     
     def _calculate_ph_score(self, ph: float) -> float:
         """Calculate pH score (optimal range 6.0-7.0)"""
-        if 6.0 <= ph <= 7.0:
-            return 100
-        elif 5.5 <= ph < 6.0 or 7.0 < ph <= 7.5:
-            return 80
-        elif 5.0 <= ph < 5.5 or 7.5 < ph <= 8.0:
-            return 60
-        else:
-            return 40
+        return int(_PH_SCORES[np.searchsorted(_PH_BREAKS, ph, side='right')])
+    
+    def _calculate_ph_score_vec(self, ph: np.ndarray) -> np.ndarray:
+        """Calculate pH scores for an array of soil samples"""
+        return _PH_SCORES[np.searchsorted(_PH_BREAKS, ph, side='right')]
     
     def _calculate_nutrient_score(self, n: float, p: float, k: float) -> float:
         """Calculate nutrient score based on NPK levels"""
-        # Optimal ranges (simplified)
-        n_score = 100 if 20 <= n <= 40 else max(0, 100 - abs(n - 30) * 3)
-        p_score = 100 if 10 <= p <= 25 else max(0, 100 - abs(p - 17.5) * 4)
-        k_score = 100 if 100 <= k <= 150 else max(0, 100 - abs(k - 125) * 1)
-        
-        return (n_score + p_score + k_score) / 3
+        return _nutrient_score_scalar(n, p, k)
     
     def _calculate_organic_score(self, organic_matter: float) -> float:
         """Calculate organic matter score"""
-        if organic_matter >= 3.0:
-            return 100
-        elif organic_matter >= 2.0:
-            return 80
-        elif organic_matter >= 1.0:
-            return 60
-        else:
-            return 40
+        return int(_ORGANIC_SCORES[np.searchsorted(_ORGANIC_BREAKS, organic_matter, side='right')])
     
     def _generate_soil_recommendations(
         self, 
@@ -181,34 +257,26 @@ class SoilAgent:
         potassium: float
     ) -> List[str]:
         """Generate soil improvement recommendations"""
-        recommendations = []
-        
-        # pH recommendations
-        if ph < 6.0:
-            recommendations.append("Apply lime to increase soil pH")
-        elif ph > 7.5:
-            recommendations.append("Apply sulfur or organic matter to lower soil pH")
-        
-        # Organic matter recommendations
-        if organic_matter < 2.0:
-            recommendations.append("Add compost or organic matter to improve soil structure")
-        
-        # Nutrient recommendations
-        if nitrogen < 20:
-            recommendations.append("Apply nitrogen fertilizer or nitrogen-fixing cover crops")
-        elif nitrogen > 40:
-            recommendations.append("Reduce nitrogen inputs to prevent leaching")
-        
-        if phosphorus < 10:
-            recommendations.append("Apply phosphorus fertilizer")
+        return self.recommend_many(
+            np.array([[ph, organic_matter, nitrogen, phosphorus, potassium]], dtype=np.float64)
+        )[0]
+    
+    def recommend_many(self, soils: np.ndarray) -> List[List[str]]:
+        """
+        Generate soil recommendations for a panel of samples
         
-        if potassium < 100:
-            recommendations.append("Apply potassium fertilizer or potash")
+        soils is an (N, 5) array with columns [ph, organic_matter, nitrogen, phosphorus, potassium]
+        """
+        soils = np.atleast_2d(np.asarray(soils, dtype=np.float64))
         
-        if not recommendations:
-            recommendations.append("Soil conditions are good for most crops")
+        # One (N, rules) mask covering every rule for every sample
+        values = soils[:, _RULE_COLUMNS]
+        mask = np.where(_RULE_BELOW, values < _RULE_THRESHOLDS, values > _RULE_THRESHOLDS)
         
-        return recommendations
+        return [
+            _RULE_MESSAGES[row].tolist() or ["Soil conditions are good for most crops"]
+            for row in mask
+        ]
     
     def analyze_soil_crop_compatibility(
         self, 
@@ -293,10 +361,12 @@ class SoilAgent:
         try:
             # Simplified soil moisture estimation
             # In practice, this would integrate with weather data and soil characteristics
+            current_moisture = self._noise.normal(25, 5)  # % moisture
+            forecast = self._noise.normal(25, 3, 7).round(2)
             
             return {
-                'current_moisture': np.random.normal(25, 5),  # % moisture
-                'forecast_7days': [np.random.normal(25, 3) for _ in range(7)],
+                'current_moisture': current_moisture,
+                'forecast_7days': forecast.tolist(),
                 'moisture_status': 'adequate',
                 'irrigation_needed': False,
                 'recommendations': ['Monitor soil moisture regularly']
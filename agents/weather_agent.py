@@ -2,46 +2,304 @@
 Weather Agent for collecting and analyzing weather data
 """
 
+import asyncio
+import math
 import requests
-import json
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from concurrent.futures import Executor
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 import numpy as np
 
+from config import CROP_DATABASE
+from utils.cache import get_shared_cache
+from utils.http import HTTP_SESSION
+from utils.serialization import loads
+
+# Current conditions summarize the first week of the forecast
+_CURRENT_DAYS = 7
+_MAX_FORECAST_DAYS = 16  # Open-Meteo limit
+
+# Only the daily fields the processors read; unused columns just inflate the
+# response, which matters most for long historical ranges
+_DAILY_FIELDS = 'temperature_2m_max,temperature_2m_min,precipitation_sum'
+
+# One Open-Meteo query serves both current weather and the forecast
+_FORECAST_PARAMS = {
+    'current_weather': 'true',
+    'daily': _DAILY_FIELDS,
+    'timezone': 'auto',
+    'forecast_days': _MAX_FORECAST_DAYS
+}
+
+
+# Crop requirements as a struct-of-arrays table, one row per crop in CROP_NAMES order
+CROP_NAMES = np.array(list(CROP_DATABASE))
+CROP_REQUIREMENTS = np.array([
+    (
+        req['optimal_temp_range'][0], req['optimal_temp_range'][1],
+        req['rainfall_requirement'][0], req['rainfall_requirement'][1],
+        req['soil_ph_range'][0], req['soil_ph_range'][1],
+        req['growing_season_days'],
+        req['_temp_mid'], req['_rain_mid'], req['_ph_mid']
+    )
+    for req in CROP_DATABASE.values()
+], dtype=[
+    ('temp_min', 'f8'), ('temp_max', 'f8'),
+    ('rain_min', 'f8'), ('rain_max', 'f8'),
+    ('ph_min', 'f8'), ('ph_max', 'f8'),
+    ('season_days', 'i4'),
+    ('temp_mid', 'f8'), ('rain_mid', 'f8'), ('ph_mid', 'f8')
+])
+
+
+def _constant_series(value: float, days: int) -> Tuple[float, ...]:
+    """Immutable daily series filled with one value"""
+    return (float(value),) * days
+
+
+def _with_lists(data) -> Dict:
+    """Copy of a default mapping with its series as fresh lists"""
+    return {key: list(value) if isinstance(value, tuple) else value for key, value in data.items()}
+
+
+# Fallback data when the API fails; series are tuples so the constants can be shared
+_DEFAULT_WEATHER = MappingProxyType({
+    'current_temperature': 22,
+    'average_temperature': 20,
+    'total_rainfall_7days': 10,
+    'max_temperatures': _constant_series(25, 7),
+    'min_temperatures': _constant_series(15, 7),
+    'daily_rainfall': _constant_series(1.5, 7),
+    'wind_speed': 5,
+    'data_source': 'Default'
+})
+_DEFAULT_HISTORICAL = MappingProxyType({
+    'average_temperature': 20,
+    'temperature_variance': 3,
+    'total_rainfall': 50,
+    'rainfall_variance': 5,
+    'max_temperatures': _constant_series(22, 30),
+    'min_temperatures': _constant_series(18, 30),
+    'daily_precipitation': _constant_series(1.7, 30)
+})
+_DEFAULT_FORECAST = MappingProxyType({
+    'forecast_max_temps': _constant_series(24, 14),
+    'forecast_min_temps': _constant_series(16, 14),
+    'forecast_precipitation': _constant_series(2, 14),
+    'favorable_days': 10
+})
+
+# (date, 14 ISO dates starting that day) for the default forecast
+_default_dates_cache = [None, ()]
+
+
+def _default_forecast_dates() -> List[str]:
+    """Next 14 dates as YYYY-MM-DD strings, rebuilt only when the day changes"""
+    today = date.today()
+    if _default_dates_cache[0] != today:
+        _default_dates_cache[:] = [today, tuple((today + timedelta(days=i)).isoformat() for i in range(14))]
+    return list(_default_dates_cache[1])
+
+
+def _current_cache_key(latitude: float, longitude: float) -> str:
+    """Cache key for current weather at a ~1km grid cell"""
+    return f"wx:cur:{latitude:.2f}:{longitude:.2f}"
+
+
+def _forecast_cache_key(latitude: float, longitude: float) -> str:
+    """Cache key for the full 16-day forecast at a ~1km grid cell"""
+    return f"wx:fc:{latitude:.2f}:{longitude:.2f}"
+
+
+def _daily_series(values: List[float]) -> np.ndarray:
+    """
+    Daily API readings as a float64 array
+    
+    Null readings raise instead of turning into NaN, so callers fall back to
+    default data as before.
+    """
+    series = np.fromiter(values, dtype=np.float64, count=len(values))
+    if np.isnan(series).any():
+        raise ValueError("daily series contains missing readings")
+    return series
+
+
+def _daily_block(daily: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Max temperatures, min temperatures and precipitation as rows of one buffer
+    
+    Open-Meteo returns equal-length columns, so they are parsed into a single
+    (3, days) array with one NaN check; ragged input falls back to per-series parsing.
+    """
+    columns = [daily.get(field, []) for field in _DAILY_FIELDS.split(',')]
+    days = len(columns[0])
+    if any(len(values) != days for values in columns):
+        return tuple(_daily_series(values) for values in columns)
+    
+    block = np.empty((len(columns), days), dtype=np.float64)
+    for row, values in zip(block, columns):
+        row[:] = values
+    if np.isnan(block).any():
+        raise ValueError("daily series contains missing readings")
+    return block[0], block[1], block[2]
+
+
+def _pooled_mean(a: np.ndarray, b: np.ndarray) -> float:
+    """Mean of two series taken together"""
+    return float((a.sum() + b.sum()) / (a.size + b.size))
+
+
+def _pooled_moments(*series: np.ndarray) -> Tuple[float, float, float]:
+    """
+    (sum, mean, population std) of one or more series taken together
+    
+    Two passes without concatenating: the pooled mean first, then squared
+    deviations from it, which avoids the cancellation of E[x^2] - mean^2.
+    """
+    count = sum(values.size for values in series)
+    total = sum(float(values.sum()) for values in series)
+    mean = total / count
+    squares = 0.0
+    for values in series:
+        deviations = values - mean
+        squares += float(np.dot(deviations, deviations))
+    return total, mean, math.sqrt(squares / count)
+
+
+def _gdd_kernel(
+    max_temps: np.ndarray, 
+    min_temps: np.ndarray, 
+    base_temp: float, 
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Daily GDD as max(0, (max + min) / 2 - base), computed in place in a single buffer"""
+    out = np.add(max_temps, min_temps, out=out)
+    out *= 0.5
+    out -= base_temp
+    return np.maximum(out, 0.0, out=out)
+
+
+def _weather_score_kernel(
+    avg_temp, annual_rainfall, temp_min, temp_max, rain_min, rain_max, temp_mid=None, rain_mid=None
+):
+    """
+    Weather score with temperature and rainfall suitability flags
+    
+    Broadcasts over arrays, so one call can score many crops or locations.
+    Each component is 100 inside the optimal range and decays with distance
+    from the range midpoint outside it; temperature weighs 60%, rainfall 40%.
+    Precomputed midpoints can be passed in to skip recomputing them.
+    """
+    if temp_mid is None:
+        temp_mid = (temp_min + temp_max) / 2
+    if rain_mid is None:
+        rain_mid = (rain_min + rain_max) / 2
+    
+    temp_suitable = np.logical_and(temp_min <= avg_temp, avg_temp <= temp_max)
+    rain_suitable = np.logical_and(rain_min <= annual_rainfall, annual_rainfall <= rain_max)
+    
+    # Branchless: the distance penalty is zeroed inside the range by the mask,
+    # so one clip covers both the in-range 100 and the out-of-range decay
+    temp_penalty = np.abs(avg_temp - temp_mid) * 10 * ~temp_suitable
+    rain_penalty = np.abs(annual_rainfall - rain_mid) / 100 * ~rain_suitable
+    temp_score = np.clip(100.0 - temp_penalty, 0.0, 100.0)
+    rain_score = np.clip(100.0 - rain_penalty, 0.0, 100.0)
+    
+    return temp_score * 0.6 + rain_score * 0.4, temp_suitable, rain_suitable
+
+
 class WeatherAgent:
     """Specialized agent for weather data collection and analysis"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, session: Optional[requests.Session] = None):
         self.config = config
         self.open_meteo_url = config['WEATHER_API_CONFIG']['open_meteo_url']
+        # Pooled HTTP session shared across agents unless one is injected
+        self.session = session or HTTP_SESSION
+        
+        # Processed results are cached per ~1km grid cell (coordinates rounded to 2 decimals)
+        # in a process-wide cache, so every agent instance reuses earlier fetches
+        cache_config = config.get('CACHE_CONFIG', {})
+        self.cache = get_shared_cache(cache_config)
+        self.cache_ttl = {'current': 3600, 'forecast': 43200, 'historical': 2592000}
+        self.cache_ttl.update(cache_config.get('weather_ttl', {}))
         
     def get_current_weather(self, latitude: float, longitude: float) -> Dict:
         """
         Get current weather conditions for a location
         """
+        cached = self.cache.get(_current_cache_key(latitude, longitude))
+        if cached is not None:
+            return cached
+        
         try:
-            # Using Open-Meteo (free, no API key required)
-            params = {
-                'latitude': latitude,
-                'longitude': longitude,
-                'current_weather': 'true',
-                'hourly': 'temperature_2m,relative_humidity_2m,precipitation,wind_speed_10m',
-                'daily': 'temperature_2m_max,temperature_2m_min,precipitation_sum',
-                'timezone': 'auto',
-                'forecast_days': 7
-            }
-            
-            response = requests.get(self.open_meteo_url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            return self._process_weather_data(data)
+            raw = self._fetch_forecast_bundle([(latitude, longitude)])[0]
+            return self._cache_forecast_bundle(latitude, longitude, raw)['current']
             
         except Exception as e:
             print(f"Error fetching weather data: {e}")
             return self._get_default_weather_data()
     
+    def get_current_weather_batch(self, coords: List[Tuple[float, float]]) -> List[Dict]:
+        """
+        Get current weather for several locations with a single API request
+        """
+        results: List[Optional[Dict]] = [self.cache.get(_current_cache_key(lat, lon)) for lat, lon in coords]
+        
+        # Only locations missing from the cache go into the batched request
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            try:
+                locations = self._fetch_forecast_bundle([coords[i] for i in missing])
+            except Exception as e:
+                print(f"Error fetching batch weather data: {e}")
+                locations = []
+            # A location whose data cannot be processed falls back on its own
+            for i, raw in zip(missing, locations):
+                try:
+                    results[i] = self._cache_forecast_bundle(coords[i][0], coords[i][1], raw)['current']
+                except Exception as e:
+                    print(f"Error processing weather data: {e}")
+        
+        return [result if result is not None else self._get_default_weather_data() for result in results]
+    
+    def _fetch_forecast_bundle(self, coords: List[Tuple[float, float]]) -> List[Dict]:
+        """
+        Fetch current conditions and the 16-day daily forecast for one or more locations
+        """
+        # Using Open-Meteo (free, no API key required); several locations go
+        # out as comma-separated coordinates and come back as a list
+        params = {
+            'latitude': ','.join(str(lat) for lat, _ in coords),
+            'longitude': ','.join(str(lon) for _, lon in coords),
+            **_FORECAST_PARAMS
+        }
+        
+        response = self.session.get(self.open_meteo_url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = loads(response.content)
+        return data if isinstance(data, list) else [data]
+    
+    def _cache_forecast_bundle(self, latitude: float, longitude: float, raw_data: Dict) -> Dict:
+        """
+        Process one location's forecast response into current weather and forecast, caching both
+        
+        Malformed data raises before anything is cached, so callers fall back to
+        default data without it outliving the failed request.
+        """
+        daily = raw_data.get('daily', {})
+        forecast = self._process_forecast_data(raw_data)
+        current = self._process_weather_data({
+            'current_weather': raw_data.get('current_weather', {}),
+            'daily': {field: values[:_CURRENT_DAYS] for field, values in daily.items()}
+        })
+        
+        self.cache.set(_forecast_cache_key(latitude, longitude), forecast, self.cache_ttl['forecast'])
+        self.cache.set(_current_cache_key(latitude, longitude), current, self.cache_ttl['current'])
+        return {'current': current, 'forecast': forecast}
+    
     def get_historical_weather(
         self, 
         latitude: float, 
@@ -54,44 +312,96 @@ class WeatherAgent:
         try:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days_back)
+            start, end = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+            
+            cache_key = f"wx:hist:{latitude:.2f}:{longitude:.2f}:{start}:{end}"
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
             
             # Open-Meteo historical API
             historical_url = "https://archive-api.open-meteo.com/v1/archive"
             params = {
                 'latitude': latitude,
                 'longitude': longitude,
-                'start_date': start_date.strftime('%Y-%m-%d'),
-                'end_date': end_date.strftime('%Y-%m-%d'),
-                'daily': 'temperature_2m_max,temperature_2m_min,precipitation_sum,wind_speed_10m_max',
+                'start_date': start,
+                'end_date': end,
+                'daily': _DAILY_FIELDS,
                 'timezone': 'auto'
             }
             
-            response = requests.get(historical_url, params=params, timeout=10)
+            response = self.session.get(historical_url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
-            return self._process_historical_data(data)
+            data = loads(response.content)
+            historical = self._process_historical_data(data)
+            self.cache.set(cache_key, historical, self.cache_ttl['historical'])
+            return historical
             
         except Exception as e:
             print(f"Error fetching historical weather data: {e}")
             return self._get_default_historical_data()
     
+    async def fetch_all(
+        self, 
+        latitude: float, 
+        longitude: float, 
+        days_back: int = 30,
+        forecast_days: int = 14,
+        executor: Optional[Executor] = None
+    ) -> Dict:
+        """
+        Fetch current, historical and forecast weather concurrently
+        """
+        # The blocking requests calls run side by side in worker threads, so the
+        # total wait is the slowest call rather than the sum. Current weather is
+        # read after the forecast, which has already cached it from the same response.
+        loop = asyncio.get_running_loop()
+        historical, (forecast, current) = await asyncio.gather(
+            loop.run_in_executor(executor, self.get_historical_weather, latitude, longitude, days_back),
+            loop.run_in_executor(executor, self._get_forecast_and_current, latitude, longitude, forecast_days)
+        )
+        
+        return {
+            'current': current,
+            'historical': historical,
+            'forecast': forecast
+        }
+    
+    def _get_forecast_and_current(self, latitude: float, longitude: float, days: int) -> Tuple[Dict, Dict]:
+        """Forecast followed by current weather, sharing a single API request"""
+        forecast = self.get_weather_forecast(latitude, longitude, days)
+        return forecast, self.get_current_weather(latitude, longitude)
+    
     def calculate_growing_degree_days(
         self, 
-        daily_temps: List[Tuple[float, float]], 
-        base_temp: float = 10.0
-    ) -> List[float]:
+        daily_temps: Optional[List[Tuple[float, float]]] = None, 
+        base_temp: float = 10.0,
+        method: str = 'average',
+        upper_temp: float = 30.0,
+        max_temps: Optional[np.ndarray] = None,
+        min_temps: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """
         Calculate Growing Degree Days (GDD) for crop development
+        
+        Takes (max, min) pairs or separate max_temps/min_temps arrays. method='mcmaster'
+        clamps both readings to [base_temp, upper_temp] before averaging (McMaster & Wilhelm).
         """
-        gdd_values = []
+        if max_temps is None or min_temps is None:
+            temps = np.asarray(daily_temps, dtype=np.float64).reshape(-1, 2)
+            max_temps, min_temps = temps[:, 0], temps[:, 1]
+        else:
+            max_temps = np.asarray(max_temps, dtype=np.float64)
+            min_temps = np.asarray(min_temps, dtype=np.float64)
         
-        for max_temp, min_temp in daily_temps:
-            avg_temp = (max_temp + min_temp) / 2
-            gdd = max(0, avg_temp - base_temp)
-            gdd_values.append(gdd)
+        if method == 'mcmaster':
+            max_temps = np.clip(max_temps, base_temp, upper_temp)
+            min_temps = np.clip(min_temps, base_temp, upper_temp)
+        elif method != 'average':
+            raise ValueError(f"Unknown GDD method: {method}")
         
-        return gdd_values
+        return _gdd_kernel(max_temps, min_temps, base_temp)
     
     def analyze_weather_suitability(
         self, 
@@ -105,20 +415,17 @@ class WeatherAgent:
         avg_temp = weather_data.get('average_temperature', 20)
         total_rainfall = weather_data.get('total_rainfall_7days', 0)
         
-        # Temperature suitability
-        temp_min, temp_max = crop_requirements['optimal_temp_range']
-        temp_suitable = temp_min <= avg_temp <= temp_max
-        
-        # Rainfall suitability (convert weekly to annual estimate)
+        # Rainfall suitability uses a weekly-to-annual estimate
         annual_rainfall_estimate = total_rainfall * 52  # rough estimate
+        temp_min, temp_max = crop_requirements['optimal_temp_range']
         rain_min, rain_max = crop_requirements['rainfall_requirement']
-        rain_suitable = rain_min <= annual_rainfall_estimate <= rain_max
-        
-        # Overall weather score
-        temp_score = 100 if temp_suitable else max(0, 100 - abs(avg_temp - (temp_min + temp_max) / 2) * 10)
-        rain_score = 100 if rain_suitable else max(0, 100 - abs(annual_rainfall_estimate - (rain_min + rain_max) / 2) / 100)
         
-        weather_score = (temp_score * 0.6) + (rain_score * 0.4)
+        weather_score, temp_suitable, rain_suitable = (
+            value.item() for value in _weather_score_kernel(
+                avg_temp, annual_rainfall_estimate, temp_min, temp_max, rain_min, rain_max,
+                crop_requirements.get('_temp_mid'), crop_requirements.get('_rain_mid')
+            )
+        )
         
         return {
             'weather_score': weather_score,
@@ -135,6 +442,31 @@ class WeatherAgent:
             )
         }
     
+    def score_all_crops(self, weather_data: Dict) -> Dict:
+        """
+        Score every crop in the database against the same weather in one pass
+        
+        Scalar weather gives one score per crop; arrays of average temperatures and
+        rainfall (one entry per location) give a (locations, crops) matrix.
+        """
+        avg_temp = np.asarray(weather_data.get('average_temperature', 20), dtype=np.float64)[..., None]
+        total_rainfall = np.asarray(weather_data.get('total_rainfall_7days', 0), dtype=np.float64)[..., None]
+        
+        weather_scores, temp_suitable, rain_suitable = _weather_score_kernel(
+            avg_temp,
+            total_rainfall * 52,  # rough annual estimate
+            CROP_REQUIREMENTS['temp_min'], CROP_REQUIREMENTS['temp_max'],
+            CROP_REQUIREMENTS['rain_min'], CROP_REQUIREMENTS['rain_max'],
+            CROP_REQUIREMENTS['temp_mid'], CROP_REQUIREMENTS['rain_mid']
+        )
+        
+        return {
+            'crops': CROP_NAMES,
+            'weather_scores': weather_scores,
+            'temperature_suitable': temp_suitable,
+            'rainfall_suitable': rain_suitable
+        }
+    
     def get_weather_forecast(
         self, 
         latitude: float, 
@@ -144,100 +476,102 @@ class WeatherAgent:
         """
         Get weather forecast for planning
         """
-        try:
-            params = {
-                'latitude': latitude,
-                'longitude': longitude,
-                'daily': 'temperature_2m_max,temperature_2m_min,precipitation_sum,wind_speed_10m_max',
-                'timezone': 'auto',
-                'forecast_days': min(days, 16)  # Open-Meteo limit
-            }
-            
-            response = requests.get(self.open_meteo_url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            return self._process_forecast_data(data)
-            
-        except Exception as e:
-            print(f"Error fetching weather forecast: {e}")
-            return self._get_default_forecast_data()
+        # The full 16-day forecast is cached once and sliced to the requested length
+        forecast = self.cache.get(_forecast_cache_key(latitude, longitude))
+        if forecast is None:
+            try:
+                raw = self._fetch_forecast_bundle([(latitude, longitude)])[0]
+                forecast = self._cache_forecast_bundle(latitude, longitude, raw)['forecast']
+                
+            except Exception as e:
+                print(f"Error fetching weather forecast: {e}")
+                return self._get_default_forecast_data()
+        
+        return self._slice_forecast(forecast, min(days, _MAX_FORECAST_DAYS))
+    
+    def _slice_forecast(self, forecast: Dict, days: int) -> Dict:
+        """Trim a forecast to its first `days` days"""
+        if len(forecast['forecast_dates']) <= days:
+            return forecast
+        
+        precipitation = forecast['forecast_precipitation'][:days]
+        return {
+            'forecast_max_temps': forecast['forecast_max_temps'][:days],
+            'forecast_min_temps': forecast['forecast_min_temps'][:days],
+            'forecast_precipitation': precipitation,
+            'forecast_dates': forecast['forecast_dates'][:days],
+            'favorable_days': self._count_favorable_days(precipitation)
+        }
     
     def _process_weather_data(self, raw_data: Dict) -> Dict:
-        """Process raw weather data from API"""
-        try:
-            current = raw_data.get('current_weather', {})
-            hourly = raw_data.get('hourly', {})
-            daily = raw_data.get('daily', {})
-            
-            # Current conditions
-            current_temp = current.get('temperature', 20)
-            
-            # Calculate averages from daily data
-            daily_max_temps = daily.get('temperature_2m_max', [])
-            daily_min_temps = daily.get('temperature_2m_min', [])
-            daily_precipitation = daily.get('precipitation_sum', [])
-            
-            avg_temp = np.mean(daily_max_temps + daily_min_temps) if daily_max_temps and daily_min_temps else current_temp
-            total_rainfall = sum(daily_precipitation) if daily_precipitation else 0
-            
-            return {
-                'current_temperature': current_temp,
-                'average_temperature': avg_temp,
-                'total_rainfall_7days': total_rainfall,
-                'max_temperatures': daily_max_temps,
-                'min_temperatures': daily_min_temps,
-                'daily_rainfall': daily_precipitation,
-                'wind_speed': current.get('windspeed', 0),
-                'data_source': 'Open-Meteo',
-                'timestamp': datetime.now().isoformat()
-            }
-        except Exception as e:
-            print(f"Error processing weather data: {e}")
-            return self._get_default_weather_data()
+        """Process raw weather data from API; raises on malformed data so it is never cached"""
+        current = raw_data.get('current_weather', {})
+        daily = raw_data.get('daily', {})
+        
+        # Current conditions
+        current_temp = current.get('temperature', 20)
+        
+        # Daily series are computed on as arrays and handed out as lists
+        daily_max_temps, daily_min_temps, daily_precipitation = _daily_block(daily)
+        
+        # Mean over max and min readings together, without concatenating them
+        avg_temp = current_temp
+        if daily_max_temps.size and daily_min_temps.size:
+            avg_temp = _pooled_mean(daily_max_temps, daily_min_temps)
+        total_rainfall = float(daily_precipitation.sum()) if daily_precipitation.size else 0
+        
+        return {
+            'current_temperature': current_temp,
+            'average_temperature': avg_temp,
+            'total_rainfall_7days': total_rainfall,
+            'max_temperatures': daily_max_temps.tolist(),
+            'min_temperatures': daily_min_temps.tolist(),
+            'daily_rainfall': daily_precipitation.tolist(),
+            'wind_speed': current.get('windspeed', 0),
+            'data_source': 'Open-Meteo',
+            'timestamp': datetime.now().isoformat()
+        }
     
     def _process_historical_data(self, raw_data: Dict) -> Dict:
-        """Process historical weather data"""
-        try:
-            daily = raw_data.get('daily', {})
-            
-            max_temps = daily.get('temperature_2m_max', [])
-            min_temps = daily.get('temperature_2m_min', [])
-            precipitation = daily.get('precipitation_sum', [])
-            
-            return {
-                'average_temperature': np.mean(max_temps + min_temps) if max_temps and min_temps else 20,
-                'temperature_variance': np.std(max_temps + min_temps) if max_temps and min_temps else 2,
-                'total_rainfall': sum(precipitation) if precipitation else 0,
-                'rainfall_variance': np.std(precipitation) if precipitation else 5,
-                'max_temperatures': max_temps,
-                'min_temperatures': min_temps,
-                'daily_precipitation': precipitation
-            }
-        except Exception as e:
-            print(f"Error processing historical data: {e}")
-            return self._get_default_historical_data()
+        """Process historical weather data; raises on malformed data so it is never cached"""
+        daily = raw_data.get('daily', {})
+        
+        max_temps, min_temps, precipitation = _daily_block(daily)
+        
+        average_temperature, temperature_variance = 20, 2
+        if max_temps.size and min_temps.size:
+            _, average_temperature, temperature_variance = _pooled_moments(max_temps, min_temps)
+        
+        total_rainfall, rainfall_variance = 0, 5
+        if precipitation.size:
+            total_rainfall, _, rainfall_variance = _pooled_moments(precipitation)
+        
+        return {
+            'average_temperature': average_temperature,
+            'temperature_variance': temperature_variance,
+            'total_rainfall': total_rainfall,
+            'rainfall_variance': rainfall_variance,
+            'max_temperatures': max_temps.tolist(),
+            'min_temperatures': min_temps.tolist(),
+            'daily_precipitation': precipitation.tolist()
+        }
     
     def _process_forecast_data(self, raw_data: Dict) -> Dict:
-        """Process forecast data"""
-        try:
-            daily = raw_data.get('daily', {})
-            
-            return {
-                'forecast_max_temps': daily.get('temperature_2m_max', []),
-                'forecast_min_temps': daily.get('temperature_2m_min', []),
-                'forecast_precipitation': daily.get('precipitation_sum', []),
-                'forecast_dates': daily.get('time', []),
-                'favorable_days': self._count_favorable_days(daily)
-            }
-        except Exception as e:
-            print(f"Error processing forecast data: {e}")
-            return self._get_default_forecast_data()
+        """Process forecast data; raises on malformed data so it is never cached"""
+        daily = raw_data.get('daily', {})
+        max_temps, min_temps, precipitation = _daily_block(daily)
+        
+        return {
+            'forecast_max_temps': max_temps.tolist(),
+            'forecast_min_temps': min_temps.tolist(),
+            'forecast_precipitation': precipitation.tolist(),
+            'forecast_dates': daily.get('time', []),
+            'favorable_days': self._count_favorable_days(precipitation)
+        }
     
-    def _count_favorable_days(self, daily_data: Dict) -> int:
+    def _count_favorable_days(self, precipitation) -> int:
         """Count favorable days for farming activities"""
-        precipitation = daily_data.get('precipitation_sum', [])
-        return sum(1 for rain in precipitation if rain < 5)  # Days with <5mm rain
+        return int(np.count_nonzero(np.asarray(precipitation, dtype=np.float64) < 5))  # Days with <5mm rain
     
     def _generate_weather_recommendations(
         self, 
@@ -265,36 +599,12 @@ class WeatherAgent:
     
     def _get_default_weather_data(self) -> Dict:
         """Default weather data when API fails"""
-        return {
-            'current_temperature': 22,
-            'average_temperature': 20,
-            'total_rainfall_7days': 10,
-            'max_temperatures': [25] * 7,
-            'min_temperatures': [15] * 7,
-            'daily_rainfall': [1.5] * 7,
-            'wind_speed': 5,
-            'data_source': 'Default',
-            'timestamp': datetime.now().isoformat()
-        }
+        return {**_with_lists(_DEFAULT_WEATHER), 'timestamp': datetime.now().isoformat()}
     
     def _get_default_historical_data(self) -> Dict:
         """Default historical data when API fails"""
-        return {
-            'average_temperature': 20,
-            'temperature_variance': 3,
-            'total_rainfall': 50,
-            'rainfall_variance': 5,
-            'max_temperatures': [22] * 30,
-            'min_temperatures': [18] * 30,
-            'daily_precipitation': [1.7] * 30
-        }
+        return _with_lists(_DEFAULT_HISTORICAL)
     
     def _get_default_forecast_data(self) -> Dict:
         """Default forecast data when API fails"""
-        return {
-            'forecast_max_temps': [24] * 14,
-            'forecast_min_temps': [16] * 14,
-            'forecast_precipitation': [2] * 14,
-            'forecast_dates': [(datetime.now() + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(14)],
-            'favorable_days': 10
-        }
+        return {**_with_lists(_DEFAULT_FORECAST), 'forecast_dates': _default_forecast_dates()}
@@ -28,6 +28,21 @@ GEOLOCATION_CONFIG = {
     'ipapi_url': 'http://ip-api.com/json'
 }
 
+# Cache settings for API results
+CACHE_CONFIG = {
+    'backend': 'memory',  # 'memory' or 'redis'
+    'redis_url': 'redis://localhost:6379/0',
+    'max_entries': 1024,
+    'weather_ttl': {  # seconds
+        'current': 3600,        # 1 hour
+        'forecast': 43200,      # 12 hours
+        'historical': 2592000   # 30 days
+    },
+    'soil_ttl': 86400,   # 1 day - soil properties change slowly
+    'market_ttl': 300,   # 5 minutes
+    'recommendation_ttl': 300  # matches market data, which drives profit figures
+}
+
 # Crop Database - Common crops with their requirements
 CROP_DATABASE = {
     'wheat': {
@@ -96,6 +111,13 @@ CROP_DATABASE = {
     }
 }
 
+# Range midpoints derived once at import, so scoring code doesn't redo the math per call
+for _requirements in CROP_DATABASE.values():
+    _requirements['_temp_mid'] = sum(_requirements['optimal_temp_range']) / 2
+    _requirements['_rain_mid'] = sum(_requirements['rainfall_requirement']) / 2
+    _requirements['_ph_mid'] = sum(_requirements['soil_ph_range']) / 2
+del _requirements
+
 # Regional price multipliers (example for different regions)
 REGIONAL_PRICE_FACTORS = {
     'north': 1.1,  # 10% higher prices
@@ -3,12 +3,17 @@ Main Farming Agent using Google Agent Development Kit
 Orchestrates specialized agents to provide comprehensive farming recommendations
 """
 
+import argparse
+import copy
+import logging
 import os
 import sys
-import json
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Tuple, Any
 import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+import requests
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -31,32 +36,113 @@ except ImportError as e:
 from agents.weather_agent import WeatherAgent
 from agents.soil_agent import SoilAgent
 from agents.market_agent import MarketAgent
-from utils.data_processor import DataProcessor
-from config import CROP_DATABASE, WEATHER_API_CONFIG, SOIL_API_CONFIG, MARKET_API_CONFIG, GEOLOCATION_CONFIG
+from utils.data_processor import CropRow, DataProcessor
+from utils.serialization import dumps, write_json
+from config import CROP_DATABASE, WEATHER_API_CONFIG, SOIL_API_CONFIG, MARKET_API_CONFIG, GEOLOCATION_CONFIG, CACHE_CONFIG
+
+# Progress messages; silent unless logging is configured (main() turns them on for --verbose)
+logger = logging.getLogger(__name__)
+
+# Upper bound on crops analyzed at once, to stay within API rate limits
+MAX_CONCURRENT_CROP_ANALYSES = 8
+
+# Only the top-ranked crops get detailed weather, soil and risk analysis
+DETAILED_ANALYSIS_TOP_K = 5
+
+# Crops shown in the recommendations and planting calendar
+RECOMMENDATION_TOP_N = 5
+
+# Worker threads shared by all blocking agent calls
+MAX_WORKER_THREADS = 16
+
+# Crop names and requirements in database order, built once
+_ALL_CROPS = tuple(CROP_DATABASE.keys())
+_ALL_CROP_REQUIREMENTS = tuple(CROP_DATABASE.values())
+
+# Next planting month for each crop, indexed by current month - 1
+_NEXT_PLANTING_MONTH = {
+    crop_name: tuple(
+        min(requirements['planting_months'], key=lambda x: (x - month) % 12)
+        for month in range(1, 13)
+    )
+    for crop_name, requirements in CROP_DATABASE.items()
+}
+
+
+def _report_progress(progress_queue: Optional[Any], message: str) -> None:
+    """Put a progress message on the caller's queue, if it gave one"""
+    if progress_queue is not None:
+        progress_queue.put_nowait(message)
 
 class FarmingAgent:
     """
     Main farming agent that coordinates all specialized agents
     """
     
-    def __init__(self):
+    # Google ADK tools: (tool name, description, bound method name)
+    _TOOL_SPECS = (
+        ('get_crop_recommendations', 'Get crop recommendations based on location and conditions',
+         '_get_crop_recommendations_tool'),
+        ('analyze_weather', 'Analyze weather conditions for farming', '_analyze_weather_tool'),
+        ('analyze_market', 'Analyze market prices and find best selling opportunities', '_analyze_market_tool'),
+        ('calculate_profit', 'Calculate profit potential for specific crops', '_calculate_profit_tool')
+    )
+    
+    def __init__(
+        self,
+        prefetch_location: Optional[Tuple[float, float]] = None,
+        session: Optional[requests.Session] = None,
+        max_concurrent_analyses: int = MAX_CONCURRENT_CROP_ANALYSES
+    ):
         self.config = {
             'WEATHER_API_CONFIG': WEATHER_API_CONFIG,
             'SOIL_API_CONFIG': SOIL_API_CONFIG,
             'MARKET_API_CONFIG': MARKET_API_CONFIG,
-            'GEOLOCATION_CONFIG': GEOLOCATION_CONFIG
+            'GEOLOCATION_CONFIG': GEOLOCATION_CONFIG,
+            'CACHE_CONFIG': CACHE_CONFIG
         }
         
-        # Initialize specialized agents
-        self.weather_agent = WeatherAgent(self.config)
-        self.soil_agent = SoilAgent(self.config)
-        self.market_agent = MarketAgent(self.config)
+        # Initialize specialized agents; they share the given HTTP session,
+        # or the process-wide pooled one when none is passed
+        self.weather_agent = WeatherAgent(self.config, session)
+        self.soil_agent = SoilAgent(self.config, session)
+        self.market_agent = MarketAgent(self.config, session)
         self.data_processor = DataProcessor()
         
+        # One persistent pool for blocking agent calls instead of ad-hoc threads
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKER_THREADS, thread_name_prefix='farming-agent')
+        
+        # Bound on detailed crop analyses in flight per recommendation request
+        self.max_concurrent_analyses = max_concurrent_analyses
+        
+        # Recent recommendations: key -> (expiry, future with the result)
+        self._recommendation_cache: Dict[tuple, Tuple[float, asyncio.Future]] = {}
+        self._recommendation_ttl = CACHE_CONFIG.get('recommendation_ttl', 300)
+        
+        # Optionally warm the weather, soil and market caches for a known location
+        # in the background, so the first recommendation request finds them hot
+        self._warmup = []
+        if prefetch_location is not None:
+            self._warmup = self._prefetch(*prefetch_location)
+        
         # Initialize Google ADK Agent
         self.adk_agent = None
         self._initialize_adk()
     
+    def close(self) -> None:
+        """
+        Stop the worker threads; the HTTP session belongs to whoever created it
+        """
+        self._pool.shutdown(wait=False)
+    
+    def _prefetch(self, latitude: float, longitude: float) -> List[Future]:
+        """Start fetching a location's data in the thread pool; results land in the agent caches"""
+        return [
+            self._pool.submit(self.weather_agent.get_current_weather, latitude, longitude),
+            self._pool.submit(self.soil_agent.get_soil_data, latitude, longitude),
+            self._pool.submit(self.market_agent.get_current_prices)
+        ]
+    
     def _initialize_adk(self):
         """Initialize Google Agent Development Kit"""
         if not ADK_AVAILABLE:
@@ -66,10 +152,8 @@ class FarmingAgent:
         try:
             # Create tools for the agent
             tools = [
-                self._create_crop_recommendation_tool(),
-                self._create_weather_analysis_tool(),
-                self._create_market_analysis_tool(),
-                self._create_profit_calculator_tool()
+                FunctionTool(name=name, description=description, func=getattr(self, method_name))
+                for name, description, method_name in self._TOOL_SPECS
             ]
             
             # Create the agent with available API
@@ -86,82 +170,41 @@ class FarmingAgent:
             print("Falling back to standalone mode")
             self.adk_agent = None
     
-    def _create_crop_recommendation_tool(self):
-        """Create crop recommendation tool for Google ADK"""
-        if not ADK_AVAILABLE:
-            return None
-            
-        return FunctionTool(
-            name="get_crop_recommendations",
-            description="Get crop recommendations based on location and conditions",
-            func=self._get_crop_recommendations_tool
-        )
-    
-    def _create_weather_analysis_tool(self):
-        """Create weather analysis tool for Google ADK"""
-        if not ADK_AVAILABLE:
-            return None
-            
-        return FunctionTool(
-            name="analyze_weather",
-            description="Analyze weather conditions for farming",
-            func=self._analyze_weather_tool
-        )
-    
-    def _create_market_analysis_tool(self):
-        """Create market analysis tool for Google ADK"""
-        if not ADK_AVAILABLE:
-            return None
-            
-        return FunctionTool(
-            name="analyze_market",
-            description="Analyze market prices and find best selling opportunities",
-            func=self._analyze_market_tool
-        )
-    
-    def _create_profit_calculator_tool(self):
-        """Create profit calculator tool for Google ADK"""
-        if not ADK_AVAILABLE:
-            return None
-            
-        return FunctionTool(
-            name="calculate_profit",
-            description="Calculate profit potential for specific crops",
-            func=self._calculate_profit_tool
-        )
-    
     async def _get_crop_recommendations_tool(self, latitude: float, longitude: float, land_area: float = 1.0) -> str:
         """Tool function for crop recommendations"""
         try:
             recommendations = await self.get_comprehensive_recommendations(latitude, longitude, land_area)
-            return json.dumps(recommendations, indent=2)
+            return dumps(recommendations)
         except Exception as e:
             return f"Error getting recommendations: {str(e)}"
     
     async def _analyze_weather_tool(self, latitude: float, longitude: float) -> str:
         """Tool function for weather analysis"""
         try:
-            weather_data = self.weather_agent.get_current_weather(latitude, longitude)
-            return json.dumps(weather_data, indent=2)
+            weather_data = await self._run_blocking(
+                self.weather_agent.get_current_weather, latitude, longitude
+            )
+            return dumps(weather_data)
         except Exception as e:
             return f"Error analyzing weather: {str(e)}"
     
     async def _analyze_market_tool(self, crop: str, land_area: float = 1.0) -> str:
         """Tool function for market analysis"""
         try:
-            market_data = self.market_agent.calculate_profit_analysis(crop, land_area)
-            return json.dumps(market_data, indent=2)
+            market_data = await self._run_blocking(
+                self.market_agent.calculate_profit_analysis, crop, land_area
+            )
+            return dumps(market_data)
         except Exception as e:
             return f"Error analyzing market: {str(e)}"
     
     async def _calculate_profit_tool(self, crops: List[str], land_area: float = 1.0) -> str:
         """Tool function for profit calculation"""
         try:
-            profit_analyses = []
-            for crop in crops:
-                analysis = self.market_agent.calculate_profit_analysis(crop, land_area)
-                profit_analyses.append(analysis)
-            return json.dumps(profit_analyses, indent=2)
+            profit_analyses = await self._run_blocking(
+                self.market_agent.calculate_profit_analysis_many, crops, land_area
+            )
+            return dumps(profit_analyses)
         except Exception as e:
             return f"Error calculating profits: {str(e)}"
     
@@ -170,88 +213,169 @@ class FarmingAgent:
         latitude: float, 
         longitude: float, 
         land_area: float = 1.0,
-        target_crops: Optional[List[str]] = None
+        target_crops: Optional[List[str]] = None,
+        progress_queue: Optional[Any] = None
     ) -> Dict:
         """
         Get comprehensive farming recommendations for a location
+        
+        Requests for the same ~1km grid cell, land area and crops share one
+        analysis: concurrent callers await the same future, and later callers
+        reuse its result until the recommendation TTL expires.
+        
+        If progress_queue is given (an asyncio.Queue or queue.Queue), a short
+        message is put on it as each stage of a fresh analysis finishes.
         """
+        key = (f"{latitude:.2f}", f"{longitude:.2f}", land_area, tuple(target_crops or ()))
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            now = time.monotonic()
+            entry = self._recommendation_cache.get(key)
+            if entry is None:
+                break
+            expires_at, future = entry
+            # Futures belong to the loop that created them; a new asyncio.run() starts over
+            if expires_at <= now or future.get_loop() is not loop:
+                break
+            try:
+                return copy.deepcopy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                # Only the leader was cancelled, not this caller: look again, so one
+                # of the waiters starts a fresh analysis and the rest share it
+                own_task = asyncio.current_task()
+                if not future.cancelled() or getattr(own_task, 'cancelling', lambda: 0)():
+                    raise
+        
+        self._recommendation_cache = {
+            cached_key: cached for cached_key, cached in self._recommendation_cache.items()
+            if cached[0] > now
+        }
+        future = loop.create_future()
+        self._recommendation_cache[key] = (now + self._recommendation_ttl, future)
+        
         try:
-            print(f"Analyzing farming conditions for location: {latitude}, {longitude}")
-            
-            # Get environmental data
-            print("Collecting weather data...")
-            weather_data = self.weather_agent.get_current_weather(latitude, longitude)
+            recommendations = await self._build_recommendations(
+                latitude, longitude, land_area, target_crops, progress_queue
+            )
+        except asyncio.CancelledError:
+            # Cancelled: let the next caller start a fresh analysis
+            self._recommendation_cache.pop(key, None)
+            future.cancel()
+            raise
+        except Exception as e:
+            # Coalesced callers get the same error; later callers start afresh
+            future.set_exception(e)
+            future.exception()  # retrieved here, so an unawaited future is not logged
+            self._recommendation_cache.pop(key, None)
+            raise
+        
+        if 'error' in recommendations:
+            self._recommendation_cache.pop(key, None)
+        future.set_result(recommendations)
+        return copy.deepcopy(recommendations)
+    
+    async def _build_recommendations(
+        self, 
+        latitude: float, 
+        longitude: float, 
+        land_area: float,
+        target_crops: Optional[List[str]],
+        progress_queue: Optional[Any] = None
+    ) -> Dict:
+        """Run the full analysis behind get_comprehensive_recommendations"""
+        try:
+            # The agent may outlive the day it was created on: date every analysis afresh
+            self.data_processor.current_date = datetime.now()
+            
+            logger.info("Analyzing farming conditions for location: %s, %s", latitude, longitude)
+            
+            # Get environmental data; the three sources are independent, so fetch them together
+            logger.info("Collecting weather, soil and market data...")
+            weather_data, soil_data, market_data = await asyncio.gather(
+                self._run_stage(
+                    progress_queue, "Weather data collected",
+                    self.weather_agent.get_current_weather, latitude, longitude
+                ),
+                self._run_stage(
+                    progress_queue, "Soil data collected",
+                    self.soil_agent.get_soil_data, latitude, longitude
+                ),
+                self._run_stage(
+                    progress_queue, "Market prices collected",
+                    self.market_agent.get_current_prices
+                )
+            )
             
-            print("Collecting soil data...")
-            soil_data = self.soil_agent.get_soil_data(latitude, longitude)
+            # Environmental conditions for analysis, shared by every crop
+            environmental_conditions = {
+                'temperature': weather_data.get('average_temperature', 20),
+                'rainfall': weather_data.get('total_rainfall_7days', 0) * 52,  # Estimate annual
+                'soil_ph': soil_data.get('soil_ph', 6.5),
+                'soil_type': soil_data.get('soil_type', 'loam')
+            }
             
-            print("Collecting market data...")
-            market_data = self.market_agent.get_current_prices()
+            # Determine crops to analyze; explicitly requested crops are always analyzed,
+            # otherwise crops far outside their temperature or pH range are skipped
+            if target_crops:
+                crops_to_analyze = target_crops
+                crop_requirements = [CROP_DATABASE[crop_name] for crop_name in target_crops]
+                viable = [True] * len(target_crops)
+            else:
+                crops_to_analyze = _ALL_CROPS
+                crop_requirements = _ALL_CROP_REQUIREMENTS
+                viable = self.data_processor.viable_crop_mask(environmental_conditions).tolist()
+            analyzed = [i for i, is_viable in enumerate(viable) if is_viable]
             
-            # Determine crops to analyze
-            crops_to_analyze = target_crops or list(CROP_DATABASE.keys())
+            logger.info("Analyzing %d of %d crops...", len(analyzed), len(crops_to_analyze))
             
-            print(f"Analyzing {len(crops_to_analyze)} crops...")
+            # Profit analyses in one vectorized pass; skipped crops have none
+            profit_analyses = self.market_agent.calculate_profit_analysis_many(
+                [crops_to_analyze[i] for i in analyzed], land_area
+            )
+            profits = iter(profit_analyses)
+            financial_analyses = [
+                next(profits).get('financial_analysis', {}) if is_viable else {}
+                for is_viable in viable
+            ]
             
-            # Analyze each crop
-            crop_analyses = []
-            for crop_name in crops_to_analyze:
-                print(f"  Analyzing {crop_name}...")
-                
-                crop_requirements = CROP_DATABASE[crop_name]
-                
-                # Environmental conditions for analysis
-                environmental_conditions = {
-                    'temperature': weather_data.get('average_temperature', 20),
-                    'rainfall': weather_data.get('total_rainfall_7days', 0) * 52,  # Estimate annual
-                    'soil_ph': soil_data.get('soil_ph', 6.5),
-                    'soil_type': soil_data.get('soil_type', 'loam')
-                }
-                
-                # Calculate suitability score
-                suitability_score = self.data_processor.calculate_crop_suitability_score(
-                    crop_requirements, environmental_conditions
-                )
-                
-                # Calculate profit potential
-                profit_analysis = self.market_agent.calculate_profit_analysis(
-                    crop_name, land_area
-                )
-                
-                # Weather suitability analysis
-                weather_suitability = self.weather_agent.analyze_weather_suitability(
-                    weather_data, crop_requirements
-                )
-                
-                # Soil compatibility analysis
-                soil_compatibility = self.soil_agent.analyze_soil_crop_compatibility(
-                    soil_data, crop_requirements
-                )
-                
-                # Risk assessment
-                risk_assessment = self.data_processor.calculate_risk_assessment(
-                    crop_name, environmental_conditions
+            # Score, rank by combined score and keep only the best few in one pass
+            logger.info("Ranking crops by profitability and suitability...")
+            ranked_crops = self.data_processor.recommend(
+                environmental_conditions, financial_analyses, target_crops or None, viable,
+                top_k=max(DETAILED_ANALYSIS_TOP_K, RECOMMENDATION_TOP_N)
+            )
+            _report_progress(progress_queue, f"Scored {len(analyzed)} crops")
+            
+            # Detailed weather and soil analysis only for the crops that get shown,
+            # concurrently in worker threads, a bounded number at a time
+            requirements_by_crop = dict(zip(crops_to_analyze, crop_requirements))
+            top_crops = ranked_crops[:DETAILED_ANALYSIS_TOP_K]
+            semaphore = asyncio.Semaphore(self.max_concurrent_analyses)
+            results = await asyncio.gather(*(
+                self._analyze_one_crop(
+                    semaphore, crop, requirements_by_crop[crop['crop_name']],
+                    weather_data, soil_data
                 )
-                
-                crop_analysis = {
-                    'crop_name': crop_name,
-                    'suitability_score': suitability_score,
-                    'profit_analysis': profit_analysis.get('financial_analysis', {}),
-                    'weather_suitability': weather_suitability,
-                    'soil_compatibility': soil_compatibility,
-                    'risk_assessment': risk_assessment,
-                    'planting_months': crop_requirements['planting_months'],
-                    'growing_season_days': crop_requirements['growing_season_days']
-                }
-                
-                crop_analyses.append(crop_analysis)
-            
-            # Rank crops by combined score
-            print("Ranking crops by profitability and suitability...")
-            ranked_crops = self.data_processor.rank_crops_by_profitability(crop_analyses)
+                for crop in top_crops
+            ), return_exceptions=True)
+            # A failed crop keeps its ranking summary; the others are unaffected
+            for crop, result in zip(top_crops, results):
+                if isinstance(result, Exception):
+                    print(f"Detailed analysis failed for {crop['crop_name']}: {result}")
+            
+            # Risk depends only on the crop and the shared conditions: assess all at once
+            risk_assessments = self.data_processor.calculate_risk_assessment_many(
+                [crop['crop_name'] for crop in top_crops], environmental_conditions
+            )
+            for crop, risk_assessment in zip(top_crops, risk_assessments):
+                crop['risk_assessment'] = risk_assessment
+            _report_progress(progress_queue, f"Detailed analysis done for top {len(top_crops)} crops")
             
             # Generate recommendations
-            recommendations = self.data_processor.format_recommendations(ranked_crops)
+            recommendations = self.data_processor.format_recommendations(
+                ranked_crops, top_n=RECOMMENDATION_TOP_N, total_crops=len(analyzed)
+            )
             
             # Add additional information
             recommendations.update({
@@ -265,11 +389,15 @@ class FarmingAgent:
                     'soil': soil_data,
                     'market_conditions': market_data.get('market_status', 'unknown')
                 },
-                'planting_calendar': self.data_processor.generate_planting_calendar(ranked_crops[:5]),
+                'planting_calendar': self.data_processor.generate_planting_calendar(
+                    ranked_crops[:RECOMMENDATION_TOP_N]
+                ),
                 'next_steps': self._generate_next_steps(ranked_crops[:3])
             })
+            if not ranked_crops:
+                recommendations['message'] = 'No suitable crop for the current conditions.'
             
-            print("Analysis complete!")
+            logger.info("Analysis complete!")
             return recommendations
             
         except Exception as e:
@@ -280,17 +408,66 @@ class FarmingAgent:
                 'message': 'Unable to generate recommendations. Please try again.'
             }
     
+    async def _analyze_one_crop(
+        self, 
+        semaphore: asyncio.Semaphore, 
+        crop_analysis: Dict, 
+        crop_requirements: Dict, 
+        weather_data: Dict, 
+        soil_data: Dict
+    ) -> None:
+        """Add one crop's detailed analysis in a worker thread once a concurrency slot is free"""
+        async with semaphore:
+            logger.debug("  Analyzing %s...", crop_analysis['crop_name'])
+            crop_analysis.update(await self._run_blocking(
+                self._analyze_crop, crop_requirements, weather_data, soil_data
+            ))
+    
+    async def _run_stage(self, progress_queue: Optional[Any], message: str, func, *args):
+        """Run a blocking fetch in the worker pool and report when it finishes"""
+        result = await self._run_blocking(func, *args)
+        _report_progress(progress_queue, message)
+        return result
+    
+    async def _run_blocking(self, func, *args):
+        """Run a blocking agent call in the shared thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, func, *args)
+    
+    def _analyze_crop(
+        self, 
+        crop_requirements: Dict, 
+        weather_data: Dict, 
+        soil_data: Dict
+    ) -> Dict:
+        """Weather and soil analysis for a single crop"""
+        # Weather suitability analysis
+        weather_suitability = self.weather_agent.analyze_weather_suitability(
+            weather_data, crop_requirements
+        )
+        
+        # Soil compatibility analysis
+        soil_compatibility = self.soil_agent.analyze_soil_crop_compatibility(
+            soil_data, crop_requirements
+        )
+        
+        return {
+            'weather_suitability': weather_suitability,
+            'soil_compatibility': soil_compatibility
+        }
+    
     async def get_weather_forecast_analysis(self, latitude: float, longitude: float) -> Dict:
         """Get detailed weather forecast analysis"""
         try:
-            current_weather = self.weather_agent.get_current_weather(latitude, longitude)
-            forecast = self.weather_agent.get_weather_forecast(latitude, longitude)
-            historical = self.weather_agent.get_historical_weather(latitude, longitude)
+            # Current, forecast and historical weather are fetched concurrently
+            weather = await self.weather_agent.fetch_all(latitude, longitude, executor=self._pool)
+            current_weather = weather['current']
+            forecast = weather['forecast']
             
             return {
                 'current_weather': current_weather,
                 'forecast': forecast,
-                'historical_trends': historical,
+                'historical_trends': weather['historical'],
                 'farming_advice': self._generate_weather_farming_advice(current_weather, forecast)
             }
         except Exception as e:
@@ -305,8 +482,11 @@ class FarmingAgent:
         """Find best markets for selling a specific crop"""
         try:
             farmer_location = {'latitude': latitude, 'longitude': longitude}
-            markets = self.market_agent.find_best_markets(crop, farmer_location)
-            price_forecast = self.market_agent.get_seasonal_price_forecast(crop)
+            # Independent lookups; run them side by side in the worker pool
+            markets, price_forecast = await asyncio.gather(
+                self._run_blocking(self.market_agent.find_best_markets, crop, farmer_location),
+                self._run_blocking(self.market_agent.get_seasonal_price_forecast, crop)
+            )
             
             return {
                 'markets': markets,
@@ -340,7 +520,11 @@ class FarmingAgent:
         if current_month in planting_months:
             next_steps.insert(1, "Current month is optimal for planting - act quickly!")
         else:
-            next_month = min(planting_months, key=lambda x: (x - current_month) % 12)
+            next_months = _NEXT_PLANTING_MONTH.get(crop_name)
+            if next_months is not None:
+                next_month = next_months[current_month - 1]
+            else:
+                next_month = min(planting_months, key=lambda x: (x - current_month) % 12)
             next_steps.insert(1, f"Plan to plant in month {next_month} for optimal timing")
         
         return next_steps
@@ -391,19 +575,33 @@ class FarmingAgent:
         
         return strategy
     
-    async def run_interactive_session(self):
-        """Run interactive session with the farmer"""
+    async def _prompt(self, prompt: str) -> str:
+        """Read a line from stdin without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, input, prompt)
+    
+    async def run_interactive_session(
+        self,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        land_area: Optional[float] = None
+    ):
+        """Run interactive session with the farmer; values given up front are not prompted for"""
         print("🌾 Welcome to the AI Farming Advisor! 🌾")
         print("I'll help you make the best crop decisions for your farm.\n")
         
         try:
             # Get location
-            print("First, I need to know your farm location:")
-            latitude = float(input("Enter latitude (e.g., 40.7128): "))
-            longitude = float(input("Enter longitude (e.g., -74.0060): "))
+            if latitude is None or longitude is None:
+                print("First, I need to know your farm location:")
+            if latitude is None:
+                latitude = float(await self._prompt("Enter latitude (e.g., 40.7128): "))
+            if longitude is None:
+                longitude = float(await self._prompt("Enter longitude (e.g., -74.0060): "))
             
             # Get land area
-            land_area = float(input("Enter your land area in hectares (default 1.0): ") or "1.0")
+            if land_area is None:
+                land_area = float(await self._prompt("Enter your land area in hectares (default 1.0): ") or "1.0")
             
             print(f"\nAnalyzing conditions for your {land_area} hectare farm...")
             print("This may take a moment...\n")
@@ -441,15 +639,17 @@ class FarmingAgent:
         print(f"Confidence score: {summary.get('confidence_score', 0):.1f}%\n")
         
         top_recs = recommendations.get('top_recommendations', [])
+        if not top_recs:
+            print(recommendations.get('message', 'No suitable crops found'))
+            return
         print("TOP 5 CROP RECOMMENDATIONS:")
         print("-" * 30)
         
-        for i, crop in enumerate(top_recs[:5], 1):
-            print(f"{i}. {crop['crop_name'].upper()}")
-            print(f"   Suitability: {crop['suitability_score']:.1f}%")
-            profit = crop.get('profit_analysis', {})
-            print(f"   Net profit: ${profit.get('net_profit', 0):.2f}")
-            print(f"   ROI: {profit.get('roi_percentage', 0):.1f}%")
+        for i, row in enumerate(map(CropRow.from_recommendation, top_recs[:5]), 1):
+            print(f"{i}. {row.name.upper()}")
+            print(f"   Suitability: {row.suitability:.1f}%")
+            print(f"   Net profit: ${row.net_profit:.2f}")
+            print(f"   ROI: {row.roi:.1f}%")
             print()
     
     async def _interactive_followup(
@@ -466,7 +666,7 @@ class FarmingAgent:
             print("3. Detailed soil recommendations")
             print("4. Exit")
             
-            choice = input("\nEnter your choice (1-4): ").strip()
+            choice = (await self._prompt("\nEnter your choice (1-4): ")).strip()
             
             if choice == '1':
                 print("\n🌤️  WEATHER ANALYSIS")
@@ -480,7 +680,7 @@ class FarmingAgent:
                         print(f"• {tip}")
                 
             elif choice == '2':
-                crop = input("Enter crop name: ").strip().lower()
+                crop = (await self._prompt("Enter crop name: ")).strip().lower()
                 print(f"\n💰 MARKET ANALYSIS FOR {crop.upper()}")
                 print("=" * 30)
                 market_analysis = await self.find_best_markets_for_crop(crop, latitude, longitude)
@@ -506,25 +706,49 @@ class FarmingAgent:
             else:
                 print("Invalid choice. Please try again.")
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="AI Farming Advisor")
+    parser.add_argument('--interactive', action='store_true', help="run an interactive session")
+    parser.add_argument('--lat', type=float, help="farm latitude")
+    parser.add_argument('--lon', type=float, help="farm longitude")
+    parser.add_argument('--area', type=float, help="land area in hectares")
+    parser.add_argument(
+        '--verbose', action='store_true',
+        help="show analysis progress, down to individual crops (default with --interactive)"
+    )
+    return parser.parse_args(argv)
+
 # Main execution function
 async def main():
     """Main function to run the farming agent"""
-    agent = FarmingAgent()
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    # Progress is shown while a farmer waits on the interactive session, or on request
+    if args.verbose or args.interactive:
+        logger.setLevel(logging.DEBUG)
+    
+    # A location given on the command line is known before any prompt, so start fetching it now
+    prefetch_location = None
+    if args.lat is not None and args.lon is not None:
+        prefetch_location = (args.lat, args.lon)
+    agent = FarmingAgent(prefetch_location=prefetch_location)
     
     # Check if running in interactive mode
-    if len(sys.argv) > 1 and sys.argv[1] == '--interactive':
-        await agent.run_interactive_session()
+    if args.interactive:
+        await agent.run_interactive_session(args.lat, args.lon, args.area)
     else:
         # Demo mode with sample data
         print("🌾 Farming Agent Demo")
         print("=" * 30)
         
-        # Sample coordinates (Iowa, USA - major farming region)
-        latitude = 41.8781
-        longitude = -93.0977
-        land_area = 10.0  # 10 hectares
+        # Sample coordinates (Iowa, USA - major farming region) unless given
+        latitude = args.lat if args.lat is not None else 41.8781
+        longitude = args.lon if args.lon is not None else -93.0977
+        land_area = args.area if args.area is not None else 10.0  # 10 hectares
         
-        print(f"Analyzing farm conditions for Iowa location...")
+        if args.lat is None and args.lon is None:
+            print(f"Analyzing farm conditions for Iowa location...")
         print(f"Location: {latitude}, {longitude}")
         print(f"Land area: {land_area} hectares\n")
         
@@ -537,8 +761,7 @@ async def main():
             
             # Save results to file
             output_file = 'farming_recommendations.json'
-            with open(output_file, 'w') as f:
-                json.dump(recommendations, f, indent=2)
+            await asyncio.get_running_loop().run_in_executor(None, write_json, output_file, recommendations)
             print(f"\n📄 Full recommendations saved to: {output_file}")
         else:
             print(f"❌ Error: {recommendations['error']}")
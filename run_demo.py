@@ -5,7 +5,6 @@ Run this to test the system with sample data
 """
 
 import asyncio
-import json
 import sys
 import os
 from datetime import datetime
@@ -15,6 +14,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from main_agent import FarmingAgent
+    from utils.data_processor import CropRow
+    from utils.serialization import write_json
 except ImportError as e:
     print(f"❌ Import error: {e}")
     print("Please ensure all dependencies are installed:")
@@ -53,12 +54,11 @@ def print_results_summary(recommendations):
     print("-" * 40)
     
     top_recs = recommendations.get('top_recommendations', [])
-    for i, crop in enumerate(top_recs[:5], 1):
-        profit = crop.get('profit_analysis', {})
-        print(f"{i}. {crop['crop_name'].upper()}")
-        print(f"   Suitability: {crop['suitability_score']:.1f}%")
-        print(f"   Net Profit: ${profit.get('net_profit', 0):,.2f}")
-        print(f"   ROI: {profit.get('roi_percentage', 0):.1f}%")
+    for i, row in enumerate(map(CropRow.from_recommendation, top_recs[:5]), 1):
+        print(f"{i}. {row.name.upper()}")
+        print(f"   Suitability: {row.suitability:.1f}%")
+        print(f"   Net Profit: ${row.net_profit:,.2f}")
+        print(f"   ROI: {row.roi:.1f}%")
         print()
     
     # Environmental summary
@@ -84,7 +84,7 @@ def print_results_summary(recommendations):
             print(f"{i}. {step}")
         print()
 
-async def run_demo():
+async def run_demo(sequential: bool = False):
     """Run the farming agent demo"""
     
     print_header()
@@ -135,18 +135,25 @@ async def run_demo():
             # Analyze single location
             selected_location = demo_locations[int(choice) - 1]
             await analyze_location(agent, selected_location)
-        else:
-            # Analyze all locations
+        elif sequential:
+            # Analyze all locations one at a time, pausing between them
             print("\n🔍 Analyzing all demo locations...")
             for i, location in enumerate(demo_locations, 1):
-                print(f"\n{'='*60}")
-                print(f"ANALYZING LOCATION {i}: {location['name'].upper()}")
-                print(f"{'='*60}")
+                print_location_banner(i, location)
                 await analyze_location(agent, location)
                 
                 if i < len(demo_locations):
                     print("\nPress Enter to continue to next location...")
                     input()
+        else:
+            # Analyze all locations concurrently, then report them in order
+            print("\n🔍 Analyzing all demo locations concurrently...")
+            results = await asyncio.gather(*(
+                fetch_recommendations(agent, location) for location in demo_locations
+            ), return_exceptions=True)
+            for i, (location, recommendations) in enumerate(zip(demo_locations, results), 1):
+                print_location_banner(i, location)
+                report_location(location, recommendations)
     
     except KeyboardInterrupt:
         print("\n\n👋 Demo interrupted. Thank you for trying the AI Farming Advisor!")
@@ -157,35 +164,56 @@ async def run_demo():
     print("\nTo run the full web interface: streamlit run ui/streamlit_app.py")
     print("To run interactive mode: python main_agent.py --interactive")
 
-async def analyze_location(agent, location):
-    """Analyze a specific location"""
+def print_location_banner(index, location):
+    """Print the banner separating locations in an all-locations run"""
+    print(f"\n{'='*60}")
+    print(f"ANALYZING LOCATION {index}: {location['name'].upper()}")
+    print(f"{'='*60}")
+
+def results_filename(location):
+    """File the detailed results for a location are saved to"""
+    return f"demo_results_{location['name'].replace(' ', '_').replace(',', '')}.json"
+
+async def fetch_recommendations(agent, location):
+    """Get recommendations for a demo location and save them to its results file"""
+    recommendations = await agent.get_comprehensive_recommendations(
+        latitude=location['latitude'],
+        longitude=location['longitude'],
+        land_area=location['land_area']
+    )
     
-    print(f"\n📍 Analyzing {location['name']}...")
+    # Encode and write in a worker thread so other locations keep running meanwhile
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, write_json, results_filename(location), recommendations)
+    return recommendations
+
+def report_location(location, recommendations):
+    """Print the results for a location"""
+    
+    print(f"\n📍 {location['name']}")
     print(f"Coordinates: {location['latitude']:.4f}, {location['longitude']:.4f}")
     print(f"Land area: {location['land_area']} hectares")
     print(f"Description: {location['description']}")
+    
+    if isinstance(recommendations, Exception):
+        print(f"❌ Analysis failed: {recommendations}")
+        return
+    
+    print_results_summary(recommendations)
+    print(f"📄 Detailed results saved to: {results_filename(location)}")
+
+async def analyze_location(agent, location):
+    """Analyze a specific location"""
+    
+    print(f"\n📍 Analyzing {location['name']}...")
     print("\n⏳ This may take a moment...")
     
     try:
-        # Get recommendations
-        recommendations = await agent.get_comprehensive_recommendations(
-            latitude=location['latitude'],
-            longitude=location['longitude'],
-            land_area=location['land_area']
-        )
-        
-        # Print results
-        print_results_summary(recommendations)
-        
-        # Save results to file
-        filename = f"demo_results_{location['name'].replace(' ', '_').replace(',', '')}.json"
-        with open(filename, 'w') as f:
-            json.dump(recommendations, f, indent=2)
-        
-        print(f"📄 Detailed results saved to: {filename}")
-        
+        recommendations = await fetch_recommendations(agent, location)
     except Exception as e:
-        print(f"❌ Analysis failed: {e}")
+        recommendations = e
+    
+    report_location(location, recommendations)
 
 def check_dependencies():
     """Check if required dependencies are available"""
@@ -224,5 +252,5 @@ if __name__ == "__main__":
     
     print("✅ All dependencies available!")
     
-    # Run the demo
-    asyncio.run(run_demo())
+    # Run the demo; --sequential analyzes locations one at a time with pauses
+    asyncio.run(run_demo(sequential='--sequential' in sys.argv[1:]))
@@ -3,7 +3,7 @@
 Setup script for the AI Farming Advisor
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -18,7 +18,10 @@ setup(
     description="AI-powered farming agent that provides crop recommendations based on location, weather, soil, and market data",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    # Listed explicitly: the package directories have no __init__.py, so
+    # find_packages() would walk the tree and still find none of them
+    packages=["agents", "utils", "ui"],
+    py_modules=["main_agent", "run_demo", "config"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Other Audience",
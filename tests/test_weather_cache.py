@@ -0,0 +1,90 @@
+"""
+Weather results must survive a JSON round trip, as they do in the Redis cache
+"""
+
+import unittest
+
+from agents.weather_agent import WeatherAgent
+from config import WEATHER_API_CONFIG
+from utils.cache import TTLCache
+from utils.serialization import dumps, loads
+
+FORECAST_DAYS = 16
+
+
+def _raw_forecast() -> dict:
+    """Open-Meteo style response with a 16-day daily block"""
+    return {
+        'current_weather': {'temperature': 18.5, 'windspeed': 3},
+        'daily': {
+            'time': [f'2026-10-{day + 1:02d}' for day in range(FORECAST_DAYS)],
+            'temperature_2m_max': [20.0 + day % 5 for day in range(FORECAST_DAYS)],
+            'temperature_2m_min': [10.0 + day % 3 for day in range(FORECAST_DAYS)],
+            'precipitation_sum': [float(day % 7) for day in range(FORECAST_DAYS)]
+        }
+    }
+
+
+class JSONRoundTripCache(TTLCache):
+    """In-memory cache that serializes values the way RedisCache does"""
+
+    def get(self, key):
+        value = super().get(key)
+        return None if value is None else loads(dumps(value))
+
+
+class OfflineSession:
+    """Session that fails the test if the agent tries to reach the API"""
+
+    def get(self, *args, **kwargs):
+        raise AssertionError("forecast should be served from the cache")
+
+
+class StaticSession:
+    """Session that answers every request with the same payload"""
+
+    def __init__(self, payload):
+        self.content = dumps(payload).encode('utf-8')
+
+    def get(self, *args, **kwargs):
+        return self
+
+    def raise_for_status(self):
+        pass
+
+
+class ForecastBundleCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.agent = WeatherAgent({'WEATHER_API_CONFIG': WEATHER_API_CONFIG}, session=OfflineSession())
+        self.agent.cache = JSONRoundTripCache()
+
+    def test_bundle_round_trips_through_json(self):
+        bundle = self.agent._cache_forecast_bundle(41.88, -93.1, _raw_forecast())
+        self.assertEqual(loads(dumps(bundle['forecast'])), bundle['forecast'])
+        self.assertEqual(loads(dumps(bundle['current'])), bundle['current'])
+
+    def test_cached_forecast_can_be_sliced(self):
+        self.agent._cache_forecast_bundle(41.88, -93.1, _raw_forecast())
+        forecast = self.agent.get_weather_forecast(41.88, -93.1, days=7)
+
+        self.assertEqual(len(forecast['forecast_dates']), 7)
+        self.assertIsInstance(forecast['forecast_precipitation'], list)
+        self.assertEqual(forecast['forecast_precipitation'], [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        self.assertEqual(forecast['favorable_days'], 5)
+
+
+    def test_malformed_bundle_is_not_cached(self):
+        raw = _raw_forecast()
+        raw['daily']['temperature_2m_max'][0] = 'n/a'
+        with self.assertRaises(ValueError):
+            self.agent._cache_forecast_bundle(41.88, -93.1, raw)
+
+        # The fallback is served, but a later request still goes to the API
+        self.agent.session = StaticSession(raw)
+        self.assertEqual(self.agent.get_current_weather(41.88, -93.1)['data_source'], 'Default')
+        self.assertEqual(self.agent.cache._entries, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,20 +4,24 @@ User-friendly interface for farmers to get crop recommendations
 """
 
 import streamlit as st
+import altair as alt
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
 import asyncio
+import atexit
 import sys
 import os
-import json
+import queue
+import threading
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import CACHE_CONFIG
 from main_agent import FarmingAgent
+from utils.http import HTTP_SESSION
+from utils.serialization import dumps, loads
 
 # Page configuration
 st.set_page_config(
@@ -27,8 +31,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS and header; only the rules the page uses are re-sent on each rerun
+_PAGE_STYLE = """
 <style>
     .main-header {
         text-align: center;
@@ -38,42 +42,92 @@ st.markdown("""
         border-radius: 10px;
         margin-bottom: 2rem;
     }
-    .metric-card {
-        background: #f8f9fa;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 4px solid #4CAF50;
-        margin: 0.5rem 0;
-    }
-    .crop-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin: 1rem 0;
-        border-left: 4px solid #4CAF50;
-    }
-    .warning-box {
-        background: #fff3cd;
-        border: 1px solid #ffeaa7;
-        border-radius: 5px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-    .success-box {
-        background: #d4edda;
-        border: 1px solid #c3e6cb;
-        border-radius: 5px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# Initialize session state
-if 'agent' not in st.session_state:
-    st.session_state.agent = FarmingAgent()
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>🌾 AI Farming Advisor</h1>
+    <p>Get personalized crop recommendations based on your location, soil, and market conditions</p>
+</div>
+"""
+
+st.markdown(_PAGE_STYLE, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop running on a daemon thread for the lifetime of the server
+
+    Every session submits its coroutines here, so the agent's in-flight
+    request coalescing sees a single loop instead of one per click.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='farming-agent-loop', daemon=True).start()
+    return loop
+
+
+def run_async(coro, progress_queue=None, on_progress=None):
+    """
+    Run coro on the shared loop and block the script thread until it finishes
 
+    Messages the coroutine puts on progress_queue are passed to on_progress
+    from this thread, since Streamlit elements can only be updated here.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    if progress_queue is not None:
+        while not future.done():
+            try:
+                on_progress(progress_queue.get(timeout=0.1))
+            except queue.Empty:
+                pass
+        while not progress_queue.empty():
+            on_progress(progress_queue.get_nowait())
+    return future.result()
+
+
+@st.cache_resource
+def get_agent() -> FarmingAgent:
+    """
+    One FarmingAgent shared by every session
+
+    Its sub-agents use the pooled keep-alive HTTP session, so connections are
+    reused across analyses; the worker pool is shut down when the server exits.
+    The agent dates each analysis when it runs, so sharing it does not freeze the date.
+    """
+    agent = FarmingAgent(session=HTTP_SESSION)
+    atexit.register(agent.close)
+    return agent
+
+
+@st.cache_data(show_spinner=False, ttl=CACHE_CONFIG.get('recommendation_ttl', 300))
+def run_analysis(latitude, longitude, land_area, crops, _on_progress=None):
+    """
+    Recommendations for one set of inputs, reused across reruns and sessions
+
+    crops must be hashable (a sorted tuple or None). _on_progress is left out
+    of the cache key and receives a message as each analysis stage finishes.
+    Error results are raised rather than returned so Streamlit does not cache them.
+    """
+    progress_queue = queue.Queue() if _on_progress is not None else None
+    recommendations = run_async(
+        get_agent().get_comprehensive_recommendations(
+            latitude, longitude, land_area, list(crops) if crops else None,
+            progress_queue=progress_queue
+        ),
+        progress_queue,
+        _on_progress
+    )
+    if 'error' in recommendations:
+        raise RuntimeError(recommendations['error'])
+    return recommendations
+
+
+# Up to this many crops, charts use Streamlit's native Vega-Lite charts instead of plotly
+NATIVE_CHART_MAX_CROPS = 12
+
+# Initialize session state
 if 'recommendations' not in st.session_state:
     st.session_state.recommendations = None
 
@@ -81,12 +135,7 @@ def main():
     """Main Streamlit application"""
     
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🌾 AI Farming Advisor</h1>
-        <p>Get personalized crop recommendations based on your location, soil, and market conditions</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Sidebar for inputs
     with st.sidebar:
@@ -141,20 +190,38 @@ def main():
         else:
             selected_crops = None
         
+        # Inputs that identify an analysis; a repeat click with the same ones is a no-op
+        crops_key = tuple(sorted(selected_crops)) if selected_crops else None
+        inputs = (latitude, longitude, land_area, crops_key, analysis_type)
+        
         # Action button
         if st.button("🔍 Analyze Farm Conditions", type="primary"):
-            with st.spinner("Analyzing your farm conditions... This may take a moment."):
-                try:
-                    # Run the analysis
-                    recommendations = asyncio.run(
-                        st.session_state.agent.get_comprehensive_recommendations(
-                            latitude, longitude, land_area, selected_crops
-                        )
-                    )
-                    st.session_state.recommendations = recommendations
-                    st.success("Analysis complete! Check the results below.")
-                except Exception as e:
-                    st.error(f"Error during analysis: {str(e)}")
+            if (st.session_state.recommendations is not None
+                    and st.session_state.get('last_inputs') == inputs):
+                st.info("Results below are already up to date for these inputs.")
+            else:
+                run_sidebar_analysis(latitude, longitude, land_area, crops_key, inputs)
+        
+        # Additional features
+        st.markdown("---")
+        st.subheader("🔧 Tools")
+        
+        if st.button("🔄 Reset Analysis"):
+            st.session_state.recommendations = None
+            st.rerun()
+        
+        if st.button("ℹ️ About"):
+            st.info("""
+            **AI Farming Advisor v1.0**
+            
+            This tool analyzes:
+            - Weather patterns
+            - Soil conditions  
+            - Market prices
+            - Crop suitability
+            
+            Built with Google Agent Development Kit and powered by real-time data sources.
+            """)
     
     # Main content area
     if st.session_state.recommendations is None:
@@ -190,6 +257,20 @@ def main():
         # Display results
         display_results(st.session_state.recommendations)
 
+def run_sidebar_analysis(latitude, longitude, land_area, crops_key, inputs):
+    """Run an analysis with live progress and remember which inputs produced it"""
+    with st.status("Analyzing your farm conditions... This may take a moment.", expanded=True) as status:
+        try:
+            # Run the analysis; identical inputs are served from the cache
+            recommendations = run_analysis(
+                latitude, longitude, land_area, crops_key, _on_progress=status.write
+            )
+            st.session_state.recommendations = recommendations
+            st.session_state.last_inputs = inputs
+            status.update(label="Analysis complete! Check the results below.", state="complete", expanded=False)
+        except Exception as e:
+            status.update(label=f"Error during analysis: {str(e)}", state="error")
+
 def display_results(recommendations):
     """Display the analysis results"""
     
@@ -253,6 +334,8 @@ def display_results(recommendations):
         
         with tab3:
             display_profit_analysis(top_recs)
+    else:
+        st.warning(recommendations.get('message', 'No suitable crops found'))
     
     # Environmental Conditions
     st.header("🌍 Environmental Conditions")
@@ -270,11 +353,16 @@ def display_results(recommendations):
     
     # Download option
     st.header("💾 Download Results")
+    display_downloads(recommendations, top_recs)
+
+@st.fragment
+def display_downloads(recommendations, top_recs):
+    """Display the JSON and CSV download buttons"""
     col1, col2 = st.columns(2)
     
     with col1:
         # JSON download
-        json_data = json.dumps(recommendations, indent=2)
+        json_data = to_json_bytes(recommendations)
         st.download_button(
             label="📄 Download as JSON",
             data=json_data,
@@ -285,8 +373,7 @@ def display_results(recommendations):
     with col2:
         # CSV download for top recommendations
         if top_recs:
-            df = create_recommendations_dataframe(top_recs)
-            csv_data = df.to_csv(index=False)
+            csv_data = to_csv_bytes(top_recs)
             st.download_button(
                 label="📊 Download as CSV",
                 data=csv_data,
@@ -294,64 +381,81 @@ def display_results(recommendations):
                 mime="text/csv"
             )
 
+@st.fragment
 def display_detailed_recommendations(top_recs):
     """Display detailed crop recommendations"""
     
-    for i, crop in enumerate(top_recs, 1):
-        with st.container():
-            st.markdown(f"""
-            <div class="crop-card">
-                <h3>#{i} {crop['crop_name'].title()}</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Suitability Score", f"{crop['suitability_score']:.1f}%")
-            
-            with col2:
-                profit = crop.get('profit_analysis', {})
-                net_profit = profit.get('net_profit', 0)
-                st.metric("Net Profit", f"${net_profit:,.2f}")
-            
-            with col3:
-                roi = profit.get('roi_percentage', 0)
-                st.metric("ROI", f"{roi:.1f}%")
-            
-            with col4:
-                combined_score = crop.get('combined_score', 0)
-                st.metric("Overall Score", f"{combined_score:.1f}%")
-            
-            # Additional details
-            with st.expander(f"Details for {crop['crop_name'].title()}"):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.subheader("Financial Analysis")
-                    profit_data = crop.get('profit_analysis', {})
-                    for key, value in profit_data.items():
-                        if isinstance(value, (int, float)):
-                            st.write(f"**{key.replace('_', ' ').title()}:** ${value:,.2f}")
-                        else:
-                            st.write(f"**{key.replace('_', ' ').title()}:** {value}")
-                
-                with col2:
-                    st.subheader("Risk Assessment")
-                    risk_data = crop.get('risk_assessment', {})
-                    risk_levels = risk_data.get('risk_levels', {})
-                    for risk_type, level in risk_levels.items():
-                        color = "🟢" if level == "low" else "🟡" if level == "medium" else "🔴"
-                        st.write(f"{color} **{risk_type.replace('_', ' ').title()}:** {level.title()}")
+    # One table for every crop instead of four metric widgets per crop
+    df = create_recommendations_dataframe(top_recs)
+    st.dataframe(
+        df[['Rank', 'Crop Name', 'Suitability Score (%)', 'Net Profit ($)', 'ROI (%)', 'Combined Score (%)']],
+        column_config={
+            'Suitability Score (%)': st.column_config.ProgressColumn(format='%.1f%%', min_value=0, max_value=100),
+            'Net Profit ($)': st.column_config.NumberColumn(format='$%.2f'),
+            'ROI (%)': st.column_config.NumberColumn(format='%.1f%%'),
+            'Combined Score (%)': st.column_config.ProgressColumn(format='%.1f%%', min_value=0, max_value=100)
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+    
+    # Additional details for the crop picked from the table
+    index = st.selectbox(
+        "Details for",
+        range(len(top_recs)),
+        format_func=lambda i: f"#{i + 1} {top_recs[i]['crop_name'].title()}"
+    )
+    crop = top_recs[index]
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Financial Analysis")
+        profit_data = crop.get('profit_analysis', {})
+        for key, value in profit_data.items():
+            if isinstance(value, (int, float)):
+                st.write(f"**{key.replace('_', ' ').title()}:** ${value:,.2f}")
+            else:
+                st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+    
+    with col2:
+        st.subheader("Risk Assessment")
+        risk_data = crop.get('risk_assessment', {})
+        risk_levels = risk_data.get('risk_levels', {})
+        for risk_type, level in risk_levels.items():
+            color = "🟢" if level == "low" else "🟡" if level == "medium" else "🔴"
+            st.write(f"{color} **{risk_type.replace('_', ' ').title()}:** {level.title()}")
 
-def display_comparison_chart(top_recs):
-    """Display comparison chart of top crops"""
+# Columns of the comparison dashboard; names are objects so long crop names are not truncated
+_COMPARISON_DTYPE = np.dtype([
+    ('name', object),
+    ('suitability', 'f8'),
+    ('combined', 'f8'),
+    ('net_profit', 'f8'),
+    ('roi', 'f8')
+])
+
+@st.cache_data(show_spinner=False)
+def build_comparison_figure(top_recs_json: str):
+    """Build the 2x2 comparison dashboard once per distinct recommendation set"""
+    # plotly is imported on first chart so the welcome screen loads without it
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     
-    # Prepare data for chart
-    crops = [crop['crop_name'].title() for crop in top_recs]
-    suitability_scores = [crop['suitability_score'] for crop in top_recs]
-    combined_scores = [crop.get('combined_score', 0) for crop in top_recs]
-    profits = [crop.get('profit_analysis', {}).get('net_profit', 0) for crop in top_recs]
+    top_recs = loads(top_recs_json)
+    
+    # Prepare data for chart: one pass into a structured array, one column per panel
+    rows = []
+    for crop in top_recs:
+        profit = crop.get('profit_analysis', {})
+        rows.append((
+            crop['crop_name'].title(),
+            crop['suitability_score'],
+            crop.get('combined_score', 0),
+            profit.get('net_profit', 0),
+            profit.get('roi_percentage', 0)
+        ))
+    chart_data = np.array(rows, dtype=_COMPARISON_DTYPE)
+    crops = chart_data['name']
     
     # Create subplot
     fig = make_subplots(
@@ -363,54 +467,60 @@ def display_comparison_chart(top_recs):
     
     # Suitability scores
     fig.add_trace(
-        go.Bar(x=crops, y=suitability_scores, name="Suitability", marker_color='lightgreen'),
+        go.Bar(x=crops, y=chart_data['suitability'], name="Suitability", marker_color='lightgreen'),
         row=1, col=1
     )
     
     # Combined scores
     fig.add_trace(
-        go.Bar(x=crops, y=combined_scores, name="Combined Score", marker_color='lightblue'),
+        go.Bar(x=crops, y=chart_data['combined'], name="Combined Score", marker_color='lightblue'),
         row=1, col=2
     )
     
     # Net profit
     fig.add_trace(
-        go.Bar(x=crops, y=profits, name="Net Profit", marker_color='gold'),
+        go.Bar(x=crops, y=chart_data['net_profit'], name="Net Profit", marker_color='gold'),
         row=2, col=1
     )
     
     # ROI comparison
-    roi_values = [crop.get('profit_analysis', {}).get('roi_percentage', 0) for crop in top_recs]
     fig.add_trace(
-        go.Bar(x=crops, y=roi_values, name="ROI %", marker_color='salmon'),
+        go.Bar(x=crops, y=chart_data['roi'], name="ROI %", marker_color='salmon'),
         row=2, col=2
     )
     
-    fig.update_layout(height=600, showlegend=False, title_text="Crop Comparison Dashboard")
-    st.plotly_chart(fig, use_container_width=True)
+    # uirevision keeps zoom/pan state when Streamlit reruns the script
+    fig.update_layout(height=600, showlegend=False, title_text="Crop Comparison Dashboard", uirevision='static')
+    return fig
 
-def display_profit_analysis(top_recs):
-    """Display detailed profit analysis"""
+@st.fragment
+def display_comparison_chart(top_recs):
+    """Display comparison chart of top crops"""
+    if len(top_recs) > NATIVE_CHART_MAX_CROPS:
+        st.plotly_chart(build_comparison_figure(dumps(top_recs)), use_container_width=True)
+        return
     
-    # Create profit comparison dataframe
-    profit_data = []
-    for crop in top_recs:
-        profit_analysis = crop.get('profit_analysis', {})
-        profit_data.append({
-            'Crop': crop['crop_name'].title(),
-            'Gross Revenue': profit_analysis.get('gross_revenue', 0),
-            'Total Costs': profit_analysis.get('total_costs', 0),
-            'Net Profit': profit_analysis.get('net_profit', 0),
-            'Profit Margin (%)': profit_analysis.get('profit_margin', 0),
-            'ROI (%)': profit_analysis.get('roi_percentage', 0)
-        })
-    
-    df = pd.DataFrame(profit_data)
+    # Few crops: four native bar charts are a far smaller payload than a plotly dashboard
+    df = create_recommendations_dataframe(top_recs).set_index('Crop Name')
+    panels = (
+        ('Suitability Scores', 'Suitability Score (%)', '#90ee90'),
+        ('Combined Scores', 'Combined Score (%)', '#add8e6'),
+        ('Net Profit', 'Net Profit ($)', '#ffd700'),
+        ('ROI Comparison', 'ROI (%)', '#fa8072')
+    )
+    for row in (panels[:2], panels[2:]):
+        for col, (title, column, color) in zip(st.columns(2), row):
+            with col:
+                st.caption(title)
+                st.bar_chart(df[column], color=color)
+
+@st.cache_data(show_spinner=False)
+def build_profit_figure(top_recs_json: str):
+    """Build the profit vs cost scatter once per distinct recommendation set"""
+    import plotly.express as px
     
-    # Display table
-    st.dataframe(df, use_container_width=True)
+    df = create_profit_dataframe(loads(top_recs_json))
     
-    # Profit vs Cost scatter plot
     fig = px.scatter(
         df, 
         x='Total Costs', 
@@ -419,12 +529,37 @@ def display_profit_analysis(top_recs):
         color='ROI (%)',
         hover_name='Crop',
         title="Profit vs Cost Analysis",
-        labels={'Total Costs': 'Total Costs ($)', 'Net Profit': 'Net Profit ($)'}
+        labels={'Total Costs': 'Total Costs ($)', 'Net Profit': 'Net Profit ($)'},
+        render_mode='webgl'
     )
     
-    fig.update_layout(height=400)
-    st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(height=400, uirevision='static')
+    return fig
 
+@st.fragment
+def display_profit_analysis(top_recs):
+    """Display detailed profit analysis"""
+    
+    # Create profit comparison dataframe
+    df = create_profit_dataframe(top_recs)
+    
+    # Display table
+    st.dataframe(df, use_container_width=True)
+    
+    # Profit vs Cost scatter plot, sized by revenue and coloured by ROI
+    if len(top_recs) > NATIVE_CHART_MAX_CROPS:
+        st.plotly_chart(build_profit_figure(dumps(top_recs)), use_container_width=True)
+        return
+    chart = alt.Chart(df, title="Profit vs Cost Analysis").mark_circle().encode(
+        x=alt.X('Total Costs', title='Total Costs ($)'),
+        y=alt.Y('Net Profit', title='Net Profit ($)'),
+        size='Gross Revenue',
+        color=alt.Color('ROI (%)', scale=alt.Scale(scheme='viridis')),
+        tooltip=['Crop', 'Total Costs', 'Net Profit', 'Gross Revenue', 'ROI (%)']
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+@st.fragment
 def display_environmental_summary(env_summary):
     """Display environmental conditions summary"""
     
@@ -455,12 +590,16 @@ def display_environmental_summary(env_summary):
             overall_score = quality_scores.get('overall_score', 0)
             st.metric("Soil Quality Score", f"{overall_score:.1f}%")
 
-def display_planting_calendar(planting_calendar):
-    """Display planting calendar"""
+@st.cache_data(show_spinner=False)
+def build_planting_calendar(planting_calendar_json: str):
+    """
+    Build the calendar table and heatmap once per distinct calendar
+
+    Returns (None, None) when no month has a recommended crop.
+    """
+    import plotly.graph_objects as go
     
-    if not planting_calendar:
-        st.info("No planting calendar data available.")
-        return
+    planting_calendar = loads(planting_calendar_json)
     
     calendar_data = []
     for month_key, month_data in planting_calendar.items():
@@ -475,26 +614,38 @@ def display_planting_calendar(planting_calendar):
                 'Expected Profit': crop.get('expected_profit', 0)
             })
     
-    if calendar_data:
-        df = pd.DataFrame(calendar_data)
-        
-        # Create calendar heatmap
-        pivot_df = df.pivot_table(
-            index='Crop', 
-            columns='Month', 
-            values='Suitability Score', 
-            fill_value=0
-        )
-        
-        fig = px.imshow(
-            pivot_df.values,
-            x=pivot_df.columns,
-            y=pivot_df.index,
-            color_continuous_scale='Greens',
-            title="Planting Calendar - Suitability Scores by Month"
-        )
-        
-        fig.update_layout(height=400)
+    if not calendar_data:
+        return None, None
+    
+    df = pd.DataFrame(calendar_data)
+    
+    # Crop x month grid scattered straight into an array, months in calendar order
+    months = [
+        month_data.get('month_name', month_key)
+        for month_key, month_data in planting_calendar.items()
+        if month_data.get('recommended_crops')
+    ]
+    crop_names = sorted(df['Crop'].unique())
+    rows = df['Crop'].map({name: i for i, name in enumerate(crop_names)}).to_numpy()
+    cols = df['Month'].map({name: j for j, name in enumerate(months)}).to_numpy()
+    grid = np.zeros((len(crop_names), len(months)))
+    grid[rows, cols] = df['Suitability Score'].to_numpy(dtype=float)
+    
+    fig = go.Figure(go.Heatmap(z=grid, x=months, y=crop_names, colorscale='Greens'))
+    fig.update_layout(title_text="Planting Calendar - Suitability Scores by Month", height=400)
+    return df, fig
+
+@st.fragment
+def display_planting_calendar(planting_calendar):
+    """Display planting calendar"""
+    
+    if not planting_calendar:
+        st.info("No planting calendar data available.")
+        return
+    
+    df, fig = build_planting_calendar(dumps(planting_calendar))
+    
+    if df is not None:
         st.plotly_chart(fig, use_container_width=True)
         
         # Display table
@@ -502,47 +653,62 @@ def display_planting_calendar(planting_calendar):
     else:
         st.info("No specific planting recommendations for the analyzed timeframe.")
 
+# Flattened recommendation fields and their column names in each table
+_EXPORT_COLUMNS = {
+    'rank': 'Rank',
+    'crop_name': 'Crop Name',
+    'suitability_score': 'Suitability Score (%)',
+    'combined_score': 'Combined Score (%)',
+    'profit_analysis.net_profit': 'Net Profit ($)',
+    'profit_analysis.roi_percentage': 'ROI (%)',
+    'profit_analysis.profit_margin': 'Profit Margin (%)',
+    'profit_analysis.gross_revenue': 'Gross Revenue ($)',
+    'profit_analysis.total_costs': 'Total Costs ($)'
+}
+
+_PROFIT_COLUMNS = {
+    'crop_name': 'Crop',
+    'profit_analysis.gross_revenue': 'Gross Revenue',
+    'profit_analysis.total_costs': 'Total Costs',
+    'profit_analysis.net_profit': 'Net Profit',
+    'profit_analysis.profit_margin': 'Profit Margin (%)',
+    'profit_analysis.roi_percentage': 'ROI (%)'
+}
+
+
+def _normalize_recommendations(top_recs, columns):
+    """
+    Flatten top_recs in one json_normalize pass and keep the given columns
+
+    Missing fields become 0, matching the old per-row .get(..., 0) defaults.
+    """
+    df = pd.json_normalize(top_recs, max_level=1).reindex(columns=list(columns))
+    df['crop_name'] = df['crop_name'].str.title()
+    return df.fillna(0).rename(columns=columns)
+
+
+@st.cache_data(show_spinner=False)
+def create_profit_dataframe(top_recs):
+    """Create the profit comparison table shown in the Profit Analysis tab"""
+    return _normalize_recommendations(top_recs, _PROFIT_COLUMNS)
+
+
+@st.cache_data(show_spinner=False)
 def create_recommendations_dataframe(top_recs):
     """Create a DataFrame from recommendations for CSV export"""
-    
-    data = []
-    for crop in top_recs:
-        profit_analysis = crop.get('profit_analysis', {})
-        data.append({
-            'Rank': crop.get('rank', 0),
-            'Crop Name': crop['crop_name'].title(),
-            'Suitability Score (%)': crop['suitability_score'],
-            'Combined Score (%)': crop.get('combined_score', 0),
-            'Net Profit ($)': profit_analysis.get('net_profit', 0),
-            'ROI (%)': profit_analysis.get('roi_percentage', 0),
-            'Profit Margin (%)': profit_analysis.get('profit_margin', 0),
-            'Gross Revenue ($)': profit_analysis.get('gross_revenue', 0),
-            'Total Costs ($)': profit_analysis.get('total_costs', 0)
-        })
-    
-    return pd.DataFrame(data)
-
-# Additional features in sidebar
-with st.sidebar:
-    st.markdown("---")
-    st.subheader("🔧 Tools")
-    
-    if st.button("🔄 Reset Analysis"):
-        st.session_state.recommendations = None
-        st.rerun()
-    
-    if st.button("ℹ️ About"):
-        st.info("""
-        **AI Farming Advisor v1.0**
-        
-        This tool analyzes:
-        - Weather patterns
-        - Soil conditions  
-        - Market prices
-        - Crop suitability
-        
-        Built with Google Agent Development Kit and powered by real-time data sources.
-        """)
+    return _normalize_recommendations(top_recs, _EXPORT_COLUMNS)
+
+
+@st.cache_data(show_spinner=False)
+def to_json_bytes(recommendations) -> bytes:
+    """Serialize the full results for download once per result set"""
+    return dumps(recommendations, indent=True).encode('utf-8')
+
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(top_recs) -> bytes:
+    """Serialize the top recommendations table for download once per result set"""
+    return create_recommendations_dataframe(top_recs).to_csv(index=False).encode('utf-8')
 
 if __name__ == "__main__":
     main()
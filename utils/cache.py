@@ -0,0 +1,129 @@
+"""
+Small TTL caches for API results, in memory or backed by Redis
+"""
+
+import copy
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.serialization import dumps, loads
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after a per-key TTL"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return a copy of the cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+        # Callers are free to mutate what they get back
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store value under key for ttl seconds
+        """
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._evict()
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, or the oldest one if none have expired"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        if not expired:
+            del self._entries[next(iter(self._entries))]
+
+
+class RedisCache:
+    """Cache backed by Redis so results are shared across processes"""
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value, or None if missing or Redis is unreachable
+        """
+        try:
+            raw = self._client.get(key)
+        except redis.RedisError as e:
+            print(f"Cache read failed for {key}: {e}")
+            return None
+        return loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store value under key for ttl seconds
+        """
+        try:
+            self._client.setex(key, int(ttl), dumps(value))
+        except redis.RedisError as e:
+            print(f"Cache write failed for {key}: {e}")
+
+    def clear(self) -> None:
+        """Drop every entry in the configured database"""
+        self._client.flushdb()
+
+
+def build_cache(cache_config: Optional[Dict] = None):
+    """
+    Create the cache backend described by CACHE_CONFIG
+    """
+    cache_config = cache_config or {}
+    if cache_config.get('backend') == 'redis':
+        if REDIS_AVAILABLE:
+            return RedisCache(cache_config.get('redis_url', 'redis://localhost:6379/0'))
+        print("redis package not installed - falling back to in-memory cache")
+    return TTLCache(cache_config.get('max_entries', 1024))
+
+
+# Caches shared by every agent in the process, keyed by backend settings
+_shared_caches: Dict[tuple, Any] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache(cache_config: Optional[Dict] = None):
+    """
+    Return the process-wide cache for this CACHE_CONFIG, creating it on first use
+    """
+    cache_config = cache_config or {}
+    key = (
+        cache_config.get('backend', 'memory'),
+        cache_config.get('redis_url'),
+        cache_config.get('max_entries', 1024)
+    )
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = build_cache(cache_config)
+        return cache
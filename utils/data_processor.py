@@ -4,15 +4,213 @@ Data processing utilities for the farming agent
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-import json
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+from config import CROP_DATABASE
+
+# Crop requirements as struct-of-arrays columns, one entry per crop
+_CROP_NAMES = tuple(CROP_DATABASE)
+_CROP_INDEX = {name: i for i, name in enumerate(_CROP_NAMES)}
+
+
+def _requirement_column(key: str, position: int) -> np.ndarray:
+    """One bound of a (min, max) requirement for every crop"""
+    return np.array([req[key][position] for req in CROP_DATABASE.values()], dtype=np.float64)
+
+
+_TEMP_MIN = _requirement_column('optimal_temp_range', 0)
+_TEMP_MAX = _requirement_column('optimal_temp_range', 1)
+_RAIN_MIN = _requirement_column('rainfall_requirement', 0)
+_RAIN_MAX = _requirement_column('rainfall_requirement', 1)
+_PH_MIN = _requirement_column('soil_ph_range', 0)
+_PH_MAX = _requirement_column('soil_ph_range', 1)
+_PH_MID = np.array([req['_ph_mid'] for req in CROP_DATABASE.values()], dtype=np.float64)
+
+# soil_mask[crop, soil] is True when the crop lists that soil type
+_SOIL_TYPE_INDEX = {
+    soil: j for j, soil in enumerate(sorted({s for req in CROP_DATABASE.values() for s in req['soil_types']}))
+}
+_SOIL_MASK = np.zeros((len(_CROP_NAMES), len(_SOIL_TYPE_INDEX)), dtype=bool)
+for _i, _req in enumerate(CROP_DATABASE.values()):
+    _SOIL_MASK[_i, [_SOIL_TYPE_INDEX[soil] for soil in _req['soil_types']]] = True
+
+# planting_mask[crop, month - 1] is True when the crop can be planted that month
+_PLANTING_MASK = np.zeros((len(_CROP_NAMES), 12), dtype=bool)
+for _i, _req in enumerate(CROP_DATABASE.values()):
+    _PLANTING_MASK[_i, np.asarray(_req['planting_months']) - 1] = True
+del _i, _req
+
+
+# Crops this far outside their temperature (degrees C) or pH range are not worth analyzing
+_TEMP_REJECT_MARGIN = 10.0
+_PH_REJECT_MARGIN = 1.5
+
+
+def _crop_indices(crops: Optional[List[str]]) -> np.ndarray:
+    """Row indices into the crop columns, for all crops when crops is None"""
+    if crops is None:
+        return np.arange(len(_CROP_NAMES))
+    return np.array([_CROP_INDEX[crop] for crop in crops], dtype=np.intp)
+
+
+# Suitability component kernels. They take plain floats or arrays and broadcast,
+# so the single-crop and all-crop scorers share the same arithmetic.
+def _temperature_score(temp, temp_min, temp_max):
+    """100 inside the optimal range, minus 5 per degree beyond the nearest bound"""
+    nearest = np.where(temp < temp_min, temp_min, temp_max)
+    return np.where(
+        (temp_min <= temp) & (temp <= temp_max), 100,
+        np.maximum(0, 100 - np.abs(temp - nearest) * 5)
+    )
+
+
+def _rainfall_score(rainfall, rain_min, rain_max):
+    """100 inside the required range; shortfall is penalized harder than excess"""
+    penalty = np.where(
+        rainfall < rain_min,
+        np.abs(rainfall - rain_min) / rain_min * 50,
+        np.abs(rainfall - rain_max) / rain_max * 30
+    )
+    return np.where(
+        (rain_min <= rainfall) & (rainfall <= rain_max), 100,
+        np.maximum(0, 100 - penalty)
+    )
+
+
+def _ph_score(ph, ph_min, ph_max, ph_mid):
+    """100 inside the pH range, minus 20 per unit from the range midpoint outside it"""
+    return np.where(
+        (ph_min <= ph) & (ph <= ph_max), 100,
+        np.maximum(0, 100 - np.abs(ph - ph_mid) * 20)
+    )
+
+
+def _soil_type_score(soil_match):
+    """Full marks for a listed soil type, partial compatibility otherwise"""
+    return np.where(soil_match, 100, 50)
+
+
+def _seasonal_score(current_month: int, planting_mask: np.ndarray):
+    """100 in a planting month, minus 20 per month of circular distance to the closest one"""
+    month_gap = np.abs(current_month - np.arange(1, 13))
+    month_distance = np.minimum(month_gap, 12 - month_gap)
+    closest_distance = np.where(planting_mask, month_distance, 12).min(axis=-1)
+    return np.maximum(0, 100 - closest_distance * 20)
+
+# seasonal_scores[crop, month - 1]: seasonal timing score of every crop in every month,
+# so scoring all crops for the current month is a single column lookup. The scores are
+# whole numbers in 0-100, so uint8 holds them exactly
+_SEASONAL_SCORES = np.stack(
+    [_seasonal_score(month, _PLANTING_MASK) for month in range(1, 13)], axis=1
+).astype(np.uint8)
+
+
+# Weighted decision matrix for suitability: one weight per criterion column, in order
+# temperature, rainfall, soil pH, soil type and seasonal timing (always scored)
+_SUITABILITY_CRITERIA = ('temperature', 'rainfall', 'soil_ph', 'soil_type', None)
+_SUITABILITY_WEIGHTS = np.array([0.3, 0.25, 0.2, 0.15, 0.1])
+
+
+def _weighted_suitability(criteria: np.ndarray, environmental_conditions: Dict):
+    """
+    Weighted sum over the last (criterion) axis, renormalized over the criteria provided
+    
+    Absent conditions get weight 0. A row-wise sum rather than criteria @ weights keeps
+    the left-to-right summation order, so scores and ranking ties match exactly.
+    """
+    # Usual case: every condition is known and the weights already sum to exactly 1
+    if all(key in environmental_conditions for key in _SUITABILITY_CRITERIA[:-1]):
+        return (criteria * _SUITABILITY_WEIGHTS).sum(axis=-1)
+    provided = np.array(
+        [key is None or key in environmental_conditions for key in _SUITABILITY_CRITERIA]
+    )
+    weights = np.where(provided, _SUITABILITY_WEIGHTS, 0.0)
+    return (criteria * weights).sum(axis=-1) / weights.sum()
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in the same order a stable
+    descending argsort would give (ties keep their input order)
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    # Everything above the k-th best score is in; ties at it fill the rest in input order
+    threshold = np.partition(scores, scores.size - k)[scores.size - k]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:k - above.size]
+    candidates = np.concatenate([above, tied])
+    candidates.sort()
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+# Risk is tracked as an integer level and only turned into a label for output
+_RISK_LOW, _RISK_MEDIUM, _RISK_HIGH = 1, 2, 3
+_RISK_NAMES = ('low', 'medium', 'high')  # indexed by level - 1
+
+# Crops whose prices swing with the season (simplified market volatility)
+_SEASONAL_CROPS = frozenset(('tomatoes', 'potatoes', 'carrots'))
+
+
+def _weather_risk(environmental_data: Dict) -> Tuple[int, List[str]]:
+    """Weather risk level and the factors behind it, from the same conditions for any crop"""
+    weather_risk = _RISK_LOW
+    risk_factors = []
+    
+    if 'temperature_variance' in environmental_data:
+        temp_var = environmental_data['temperature_variance']
+        if temp_var > 5:
+            weather_risk = _RISK_HIGH
+            risk_factors.append("High temperature variability")
+        elif temp_var > 3:
+            weather_risk = _RISK_MEDIUM
+            risk_factors.append("Moderate temperature variability")
+    
+    # Rainfall risk
+    if 'rainfall_uncertainty' in environmental_data:
+        if environmental_data['rainfall_uncertainty'] > 30:
+            weather_risk = _RISK_HIGH
+            risk_factors.append("High rainfall uncertainty")
+    
+    return weather_risk, risk_factors
+
+
+def _risk_labels(weather: int, market: int, pest: int, overall: int) -> Dict[str, str]:
+    """Presentation form of one crop's risk levels"""
+    return {
+        'weather_risk': _RISK_NAMES[weather - 1],
+        'market_risk': _RISK_NAMES[market - 1],
+        'pest_risk': _RISK_NAMES[pest - 1],
+        'overall_risk': _RISK_NAMES[overall - 1]
+    }
+
+
+class CropRow(NamedTuple):
+    """Display fields of one top recommendation, unpacked once"""
+    name: str
+    suitability: float
+    net_profit: float
+    roi: float
+    
+    @classmethod
+    def from_recommendation(cls, crop: Dict) -> 'CropRow':
+        profit = crop.get('profit_analysis', {})
+        return cls(
+            crop['crop_name'],
+            crop['suitability_score'],
+            profit.get('net_profit', 0),
+            profit.get('roi_percentage', 0)
+        )
+
 
 class DataProcessor:
     """Handles data processing and analysis for farming recommendations"""
     
     def __init__(self):
         self.current_date = datetime.now()
+        # (date, isoformat string) so format_recommendations formats each date once
+        self._timestamp_cache = (None, '')
     
     def calculate_crop_suitability_score(
         self, 
@@ -23,86 +221,100 @@ class DataProcessor:
         Calculate suitability score for a crop based on environmental conditions
         Returns a score from 0-100
         """
-        score = 0.0
-        total_factors = 0
+        criteria = np.zeros(len(_SUITABILITY_WEIGHTS))
         
         # Temperature compatibility (30% weight)
         if 'temperature' in environmental_conditions:
-            temp = environmental_conditions['temperature']
             temp_min, temp_max = crop_requirements['optimal_temp_range']
-            
-            if temp_min <= temp <= temp_max:
-                temp_score = 100
-            else:
-                # Calculate penalty based on distance from optimal range
-                if temp < temp_min:
-                    temp_score = max(0, 100 - abs(temp - temp_min) * 5)
-                else:
-                    temp_score = max(0, 100 - abs(temp - temp_max) * 5)
-            
-            score += temp_score * 0.3
-            total_factors += 0.3
+            criteria[0] = _temperature_score(environmental_conditions['temperature'], temp_min, temp_max)
         
         # Rainfall compatibility (25% weight)
         if 'rainfall' in environmental_conditions:
-            rainfall = environmental_conditions['rainfall']
             rain_min, rain_max = crop_requirements['rainfall_requirement']
-            
-            if rain_min <= rainfall <= rain_max:
-                rain_score = 100
-            else:
-                if rainfall < rain_min:
-                    rain_score = max(0, 100 - abs(rainfall - rain_min) / rain_min * 50)
-                else:
-                    rain_score = max(0, 100 - abs(rainfall - rain_max) / rain_max * 30)
-            
-            score += rain_score * 0.25
-            total_factors += 0.25
+            criteria[1] = _rainfall_score(environmental_conditions['rainfall'], rain_min, rain_max)
         
         # Soil pH compatibility (20% weight)
         if 'soil_ph' in environmental_conditions:
-            ph = environmental_conditions['soil_ph']
             ph_min, ph_max = crop_requirements['soil_ph_range']
-            
-            if ph_min <= ph <= ph_max:
-                ph_score = 100
-            else:
-                ph_score = max(0, 100 - abs(ph - (ph_min + ph_max) / 2) * 20)
-            
-            score += ph_score * 0.2
-            total_factors += 0.2
+            ph_mid = crop_requirements.get('_ph_mid', (ph_min + ph_max) / 2)
+            criteria[2] = _ph_score(environmental_conditions['soil_ph'], ph_min, ph_max, ph_mid)
         
         # Soil type compatibility (15% weight)
         if 'soil_type' in environmental_conditions:
             soil_type = environmental_conditions['soil_type'].lower()
-            if soil_type in crop_requirements['soil_types']:
-                soil_score = 100
+            criteria[3] = _soil_type_score(soil_type in crop_requirements['soil_types'])
+        
+        # Seasonal timing (10% weight)
+        planting_mask = np.zeros(12, dtype=bool)
+        planting_mask[np.asarray(crop_requirements['planting_months']) - 1] = True
+        criteria[4] = _seasonal_score(self.current_date.month, planting_mask)
+        
+        return float(_weighted_suitability(criteria, environmental_conditions))
+    
+    def score_all_crops(
+        self, 
+        environmental_conditions: Dict,
+        crops: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        Suitability scores (0-100) for many crops against the same conditions
+        
+        Same scoring as calculate_crop_suitability_score, evaluated for every crop
+        in CROP_DATABASE at once, or for the given crops in order.
+        """
+        idx = _crop_indices(crops)
+        # Decision matrix: one row per crop, one column per criterion
+        criteria = np.zeros((idx.size, len(_SUITABILITY_WEIGHTS)))
+        
+        # Temperature compatibility (30% weight)
+        if 'temperature' in environmental_conditions:
+            temp = environmental_conditions['temperature']
+            criteria[:, 0] = _temperature_score(temp, _TEMP_MIN[idx], _TEMP_MAX[idx])
+        
+        # Rainfall compatibility (25% weight)
+        if 'rainfall' in environmental_conditions:
+            rainfall = environmental_conditions['rainfall']
+            criteria[:, 1] = _rainfall_score(rainfall, _RAIN_MIN[idx], _RAIN_MAX[idx])
+        
+        # Soil pH compatibility (20% weight)
+        if 'soil_ph' in environmental_conditions:
+            ph = environmental_conditions['soil_ph']
+            criteria[:, 2] = _ph_score(ph, _PH_MIN[idx], _PH_MAX[idx], _PH_MID[idx])
+        
+        # Soil type compatibility (15% weight)
+        if 'soil_type' in environmental_conditions:
+            soil_col = _SOIL_TYPE_INDEX.get(environmental_conditions['soil_type'].lower())
+            if soil_col is None:
+                soil_match = np.zeros(idx.size, dtype=bool)
             else:
-                soil_score = 50  # Partial compatibility
-            
-            score += soil_score * 0.15
-            total_factors += 0.15
+                soil_match = _SOIL_MASK[idx, soil_col]
+            criteria[:, 3] = _soil_type_score(soil_match)
         
         # Seasonal timing (10% weight)
-        current_month = self.current_date.month
-        if current_month in crop_requirements['planting_months']:
-            seasonal_score = 100
-        else:
-            # Find closest planting month
-            planting_months = crop_requirements['planting_months']
-            distances = [min(abs(current_month - pm), 12 - abs(current_month - pm)) 
-                        for pm in planting_months]
-            closest_distance = min(distances)
-            seasonal_score = max(0, 100 - closest_distance * 20)
-        
-        score += seasonal_score * 0.1
-        total_factors += 0.1
-        
-        # Normalize score
-        if total_factors > 0:
-            return score / total_factors
-        else:
-            return 0.0
+        criteria[:, 4] = _SEASONAL_SCORES[idx, self.current_date.month - 1]
+        
+        return _weighted_suitability(criteria, environmental_conditions)
+    
+    def viable_crop_mask(
+        self, 
+        environmental_conditions: Dict,
+        crops: Optional[List[str]] = None
+    ) -> np.ndarray:
+        """
+        True for crops whose temperature and pH ranges are within reach of the conditions
+        """
+        idx = _crop_indices(crops)
+        viable = np.ones(idx.size, dtype=bool)
+        
+        if 'temperature' in environmental_conditions:
+            temp = environmental_conditions['temperature']
+            viable &= (_TEMP_MIN[idx] - _TEMP_REJECT_MARGIN <= temp) & (temp <= _TEMP_MAX[idx] + _TEMP_REJECT_MARGIN)
+        
+        if 'soil_ph' in environmental_conditions:
+            ph = environmental_conditions['soil_ph']
+            viable &= (_PH_MIN[idx] - _PH_REJECT_MARGIN <= ph) & (ph <= _PH_MAX[idx] + _PH_REJECT_MARGIN)
+        
+        return viable
     
     def calculate_profit_potential(
         self, 
@@ -140,27 +352,127 @@ class DataProcessor:
             'roi_percentage': (net_profit / total_costs * 100) if total_costs > 0 else 0
         }
     
+    def calculate_profit_potential_many(
+        self, 
+        crop_names: List[str], 
+        market_prices: Dict, 
+        production_costs: Dict,
+        yield_estimates: List[float],
+        land_area: float = 1.0  # in hectares
+    ) -> List[Dict]:
+        """
+        Calculate profit potential for several crops in one vectorized pass
+        """
+        n = len(crop_names)
+        crop_prices = np.fromiter((market_prices.get(crop, 0) for crop in crop_names), np.float64, count=n)
+        base_costs = np.fromiter((production_costs.get(crop, 0) for crop in crop_names), np.float64, count=n)
+        yields = np.asarray(yield_estimates, dtype=np.float64)
+        
+        # Revenue, costs and profit for every crop at once
+        gross_revenues = yields * land_area * crop_prices
+        total_costs = base_costs * land_area
+        net_profits = gross_revenues - total_costs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_margins = np.where(gross_revenues > 0, net_profits / gross_revenues * 100, 0)
+            rois = np.where(total_costs > 0, net_profits / total_costs * 100, 0)
+        
+        return [
+            {
+                'crop_name': crop_name,
+                'gross_revenue': gross_revenue,
+                'total_costs': total_cost,
+                'net_profit': net_profit,
+                'profit_margin': profit_margin,
+                'yield_per_hectare': yield_estimate,
+                'price_per_unit': crop_price,
+                'roi_percentage': roi
+            }
+            for crop_name, gross_revenue, total_cost, net_profit, profit_margin, yield_estimate, crop_price, roi
+            in zip(
+                crop_names, gross_revenues.tolist(), total_costs.tolist(), net_profits.tolist(),
+                profit_margins.tolist(), yields.tolist(), crop_prices.tolist(), rois.tolist()
+            )
+        ]
+    
     def rank_crops_by_profitability(
         self, 
-        crop_analyses: List[Dict]
+        crop_analyses: List[Dict],
+        top_k: Optional[int] = None
     ) -> List[Dict]:
         """
         Rank crops by their profitability and suitability
+        
+        Every analysis gets its combined_score; with top_k only the best top_k
+        are returned, found by partitioning instead of sorting them all.
         """
-        # Combine suitability score and profit potential
-        for analysis in crop_analyses:
-            suitability = analysis.get('suitability_score', 0)
-            roi = analysis.get('profit_analysis', {}).get('roi_percentage', 0)
-            
-            # Combined score: 60% suitability, 40% profitability
-            combined_score = (suitability * 0.6) + (min(roi, 100) * 0.4)
-            analysis['combined_score'] = combined_score
+        n = len(crop_analyses)
+        suitability = np.fromiter(
+            (analysis.get('suitability_score', 0) for analysis in crop_analyses), np.float64, count=n
+        )
+        roi = np.fromiter(
+            (analysis.get('profit_analysis', {}).get('roi_percentage', 0) for analysis in crop_analyses),
+            np.float64, count=n
+        )
         
-        # Sort by combined score
-        ranked_crops = sorted(crop_analyses, key=lambda x: x['combined_score'], reverse=True)
+        # Combined score: 60% suitability, 40% profitability
+        combined = suitability * 0.6 + np.minimum(roi, 100) * 0.4
+        for analysis, combined_score in zip(crop_analyses, combined.tolist()):
+            analysis['combined_score'] = combined_score
         
-        return ranked_crops
+        # Sort by combined score, highest first; stable so ties keep their input order
+        if top_k is not None and top_k < n:
+            order = _top_k_indices(combined, top_k)
+        else:
+            order = np.argsort(-combined, kind='stable')
+        return [crop_analyses[i] for i in order.tolist()]
     
+    def recommend(
+        self,
+        environmental_conditions: Dict,
+        financial_analyses: List[Dict],
+        crops: Optional[List[str]] = None,
+        viable: Optional[List[bool]] = None,
+        top_k: int = 5
+    ) -> List[Dict]:
+        """
+        Score, rank and keep the best top_k crops in one pass
+        
+        financial_analyses lines up with crops (every crop in CROP_DATABASE when None);
+        crops where viable is False are left out entirely, so the result is empty when
+        none is viable. Scores and order match score_all_crops followed by
+        rank_crops_by_profitability, but only the top_k crops are ever turned into dicts.
+        """
+        names = _CROP_NAMES if crops is None else crops
+        candidates = np.arange(len(names)) if viable is None else np.flatnonzero(viable)
+        suitability = self.score_all_crops(environmental_conditions, crops)[candidates]
+        roi = np.fromiter(
+            (financial_analyses[i].get('roi_percentage', 0) for i in candidates.tolist()),
+            np.float64, count=candidates.size
+        )
+        
+        # Combined score: 60% suitability, 40% profitability
+        combined = suitability * 0.6 + np.minimum(roi, 100) * 0.4
+        if top_k < candidates.size:
+            order = _top_k_indices(combined, top_k)
+        else:
+            order = np.argsort(-combined, kind='stable')
+        
+        ranked = []
+        for i, suitability_score, combined_score in zip(
+            candidates[order].tolist(), suitability[order].tolist(), combined[order].tolist()
+        ):
+            requirements = CROP_DATABASE[names[i]]
+            crop = {
+                'crop_name': names[i],
+                'suitability_score': suitability_score,
+                'profit_analysis': financial_analyses[i],
+                'planting_months': requirements['planting_months'],
+                'growing_season_days': requirements['growing_season_days'],
+                'combined_score': combined_score
+            }
+            ranked.append(crop)
+        return ranked
+
     def generate_planting_calendar(
         self, 
         recommended_crops: List[Dict],
@@ -171,26 +483,31 @@ class DataProcessor:
         """
         calendar = {}
         
-        for i in range(months_ahead):
-            month_date = self.current_date + timedelta(days=30*i)
-            month_key = month_date.strftime("%Y-%m")
-            month_num = month_date.month
-            
+        # Month starts 30 days apart, and which crops can be planted in each of them:
+        # hits[crop, j] gathers the crop's planting-month mask at month j's calendar month
+        dates = pd.date_range(self.current_date, periods=months_ahead, freq='30D')
+        planting_mask = np.zeros((len(recommended_crops), 12), dtype=bool)
+        for i, crop in enumerate(recommended_crops):
+            planting_mask[i, np.asarray(crop.get('planting_months', []), dtype=np.intp) - 1] = True
+        hits = planting_mask[:, dates.month.to_numpy() - 1]
+        
+        entries = [
+            {
+                'name': crop.get('crop_name', ''),
+                'suitability_score': crop.get('suitability_score', 0),
+                'expected_profit': crop.get('profit_analysis', {}).get('net_profit', 0)
+            }
+            for crop in recommended_crops
+        ]
+        
+        # Labels for every month in one pass over the index
+        month_keys = dates.strftime("%Y-%m")
+        month_names = dates.strftime("%B %Y")
+        for j, (month_key, month_name) in enumerate(zip(month_keys, month_names)):
             calendar[month_key] = {
-                'month_name': month_date.strftime("%B %Y"),
-                'recommended_crops': []
+                'month_name': month_name,
+                'recommended_crops': [dict(entries[i]) for i in np.flatnonzero(hits[:, j]).tolist()]
             }
-            
-            for crop in recommended_crops:
-                crop_name = crop.get('crop_name', '')
-                planting_months = crop.get('planting_months', [])
-                
-                if month_num in planting_months:
-                    calendar[month_key]['recommended_crops'].append({
-                        'name': crop_name,
-                        'suitability_score': crop.get('suitability_score', 0),
-                        'expected_profit': crop.get('profit_analysis', {}).get('net_profit', 0)
-                    })
         
         return calendar
     
@@ -203,66 +520,94 @@ class DataProcessor:
         """
         Assess risks for crop cultivation
         """
-        risks = {
-            'weather_risk': 'low',
-            'market_risk': 'medium',
-            'pest_risk': 'low',
-            'overall_risk': 'low'
-        }
-        
-        risk_factors = []
-        
         # Weather risk assessment
-        if 'temperature_variance' in environmental_data:
-            temp_var = environmental_data['temperature_variance']
-            if temp_var > 5:
-                risks['weather_risk'] = 'high'
-                risk_factors.append("High temperature variability")
-            elif temp_var > 3:
-                risks['weather_risk'] = 'medium'
-                risk_factors.append("Moderate temperature variability")
-        
-        # Rainfall risk
-        if 'rainfall_uncertainty' in environmental_data:
-            rain_uncert = environmental_data['rainfall_uncertainty']
-            if rain_uncert > 30:
-                risks['weather_risk'] = 'high'
-                risk_factors.append("High rainfall uncertainty")
+        weather_risk, risk_factors = _weather_risk(environmental_data)
         
         # Market volatility (simplified)
-        seasonal_crops = ['tomatoes', 'potatoes', 'carrots']
-        if crop_name in seasonal_crops:
-            risks['market_risk'] = 'high'
+        market_risk = _RISK_MEDIUM
+        if crop_name in _SEASONAL_CROPS:
+            market_risk = _RISK_HIGH
             risk_factors.append("Seasonal price volatility")
+        pest_risk = _RISK_LOW
         
         # Overall risk calculation
-        risk_levels = {'low': 1, 'medium': 2, 'high': 3}
-        avg_risk = sum(risk_levels[risks[key]] for key in ['weather_risk', 'market_risk', 'pest_risk']) / 3
+        avg_risk = (weather_risk + market_risk + pest_risk) / 3
         
         if avg_risk >= 2.5:
-            risks['overall_risk'] = 'high'
+            overall_risk = _RISK_HIGH
         elif avg_risk >= 1.5:
-            risks['overall_risk'] = 'medium'
+            overall_risk = _RISK_MEDIUM
+        else:
+            overall_risk = _RISK_LOW
         
         return {
-            'risk_levels': risks,
+            'risk_levels': _risk_labels(weather_risk, market_risk, pest_risk, overall_risk),
             'risk_factors': risk_factors,
             'risk_score': avg_risk * 33.33  # Convert to 0-100 scale
         }
     
+    def calculate_risk_assessment_many(
+        self, 
+        crop_names: List[str], 
+        environmental_data: Dict
+    ) -> List[Dict]:
+        """
+        Assess risks for several crops grown under the same conditions
+        
+        Weather risk depends only on the shared conditions, so it is assessed once;
+        market and overall risk are evaluated for all crops as arrays.
+        """
+        weather_risk, weather_factors = _weather_risk(environmental_data)
+        seasonal = np.fromiter(
+            (crop in _SEASONAL_CROPS for crop in crop_names), bool, count=len(crop_names)
+        )
+        
+        # int8 risk levels: weather is shared, market is high for seasonal crops, pest stays low
+        market_risk = np.where(seasonal, _RISK_HIGH, _RISK_MEDIUM).astype(np.int8)
+        avg_risk = (weather_risk + market_risk + _RISK_LOW) / 3
+        overall_risk = np.select(
+            [avg_risk >= 2.5, avg_risk >= 1.5], [_RISK_HIGH, _RISK_MEDIUM], default=_RISK_LOW
+        ).astype(np.int8)
+        
+        assessments = []
+        for is_seasonal, market, overall, risk in zip(
+            seasonal.tolist(), market_risk.tolist(), overall_risk.tolist(), avg_risk.tolist()
+        ):
+            risk_factors = list(weather_factors)
+            if is_seasonal:
+                risk_factors.append("Seasonal price volatility")
+            assessments.append({
+                'risk_levels': _risk_labels(weather_risk, market, _RISK_LOW, overall),
+                'risk_factors': risk_factors,
+                'risk_score': risk * 33.33  # Convert to 0-100 scale
+            })
+        return assessments
+    
+    def _timestamp(self) -> str:
+        """current_date in ISO format, re-formatted only when current_date changes"""
+        cached_date, formatted = self._timestamp_cache
+        if cached_date != self.current_date:
+            formatted = self.current_date.isoformat()
+            self._timestamp_cache = (self.current_date, formatted)
+        return formatted
+    
     def format_recommendations(
         self, 
         ranked_crops: List[Dict],
-        top_n: int = 5
+        top_n: int = 5,
+        total_crops: Optional[int] = None
     ) -> Dict:
         """
         Format crop recommendations for user display
+        
+        total_crops defaults to len(ranked_crops); pass it when only the top
+        of the ranking was kept.
         """
         top_crops = ranked_crops[:top_n]
         
         recommendations = {
-            'timestamp': self.current_date.isoformat(),
-            'total_crops_analyzed': len(ranked_crops),
+            'timestamp': self._timestamp(),
+            'total_crops_analyzed': len(ranked_crops) if total_crops is None else total_crops,
             'top_recommendations': [],
             'summary': {
                 'best_crop': top_crops[0]['crop_name'] if top_crops else 'None',
@@ -0,0 +1,37 @@
+"""
+Shared HTTP session for the agents' API calls
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool sizing for the shared session
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.2
+RETRY_STATUSES = (502, 503, 504)
+
+
+def _build_session() -> requests.Session:
+    """Create a session whose pooled connections are reused across requests"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # Ask for compressed bodies explicitly; requests decodes them transparently
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+
+# Module-level singleton so every agent shares keep-alive connections
+HTTP_SESSION = _build_session()
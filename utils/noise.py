@@ -0,0 +1,38 @@
+"""
+Pre-drawn Gaussian noise shared by the agents
+"""
+
+import threading
+from typing import Optional, Union
+import numpy as np
+
+
+class NoiseBuffer:
+    """Buffer of N(0, 1) samples refilled in chunks to amortize RNG call overhead"""
+
+    def __init__(self, rng: Optional[np.random.Generator] = None, chunk_size: int = 4096):
+        self._rng = rng if rng is not None else np.random.default_rng()
+        self._chunk_size = chunk_size
+        self._buf = self._rng.standard_normal(chunk_size)
+        self._idx = 0
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> np.ndarray:
+        """
+        Return the next n standard normal samples
+        """
+        with self._lock:
+            if self._idx + n > self._buf.size:
+                self._buf = self._rng.standard_normal(max(self._chunk_size, n))
+                self._idx = 0
+            samples = self._buf[self._idx:self._idx + n]
+            self._idx += n
+        return samples
+
+    def normal(self, loc, scale, size: Optional[int] = None) -> Union[float, np.ndarray]:
+        """
+        Draw from N(loc, scale); a float when size is None, otherwise an array
+        """
+        if size is None:
+            return float(loc + scale * self.take(1)[0])
+        return loc + scale * self.take(size)
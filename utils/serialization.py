@@ -0,0 +1,61 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to json
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Convert numpy and datetime values that neither encoder handles natively"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize obj to a JSON string; indent=True pretty-prints with two spaces
+    """
+    if ORJSON_AVAILABLE:
+        options = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+        return orjson.dumps(obj, default=_default, option=options).decode('utf-8')
+    return json.dumps(obj, default=_default, indent=2 if indent else None)
+
+
+def loads(data: Any) -> Any:
+    """
+    Parse a JSON document from str or bytes
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_json(path: str, obj: Any, indent: bool = True) -> None:
+    """
+    Write obj to path as JSON; with orjson the encoded bytes go straight to disk
+    """
+    if ORJSON_AVAILABLE:
+        options = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, default=_default, option=options))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, default=_default, indent=2 if indent else None)